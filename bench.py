@@ -0,0 +1,415 @@
+# bench.py
+"""
+성능 벤치마크 (네트워크·브라우저 불필요).
+
+- 앱: Streamlit AppTest 로 main.py 를 헤드리스 실행해 주요 흐름별 rerun 지연(p50/p95)을 잰다.
+  (진단 제출, 상담 신청, 관리자 로그인, 선택 삭제, 전체 삭제, 관리자 프래그먼트 단독 rerun)
+  주요 실행은 브라우저로 보낸 메시지 크기(payload: bytes/msgs)도 함께 기록한다.
+- 판정: eligibility 단건/배치
+- 저장소: CSV·SQLite 에 1k/100k/1M 행이 쌓여 있을 때 append / load_df / page / delete
+- 콜드 스타트: 새 프로세스에서 앱 모듈 import 시간(-X importtime 요약 포함)과 첫 실행·첫 진단 제출 지연,
+  그 시점까지 불러온 무거운 모듈(pandas/numpy/pyarrow)
+
+결과는 JSON 으로 저장되며, --compare 로 이전 커밋 결과와 비교할 수 있다.
+
+    python bench.py                          # 전체 → bench_results.json
+    python bench.py --quick                  # 작은 규모로 빠르게
+    python bench.py --only app store --sizes 1000 100000
+    python bench.py --only startup           # 오토스케일 직후 컨테이너 기동·첫 요청 지연
+    python bench.py --compare old.json       # p50 비교
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+ADMIN_PIN = "070913"  # main.py 의 ADMIN_PIN 과 같아야 한다
+
+
+# ========= 측정 유틸 =========
+def summarize(samples) -> dict:
+    """초 단위 샘플 → ms 단위 통계."""
+    ms = sorted(s * 1000 for s in samples)
+
+    def pct(p):
+        return ms[min(len(ms) - 1, int(round(p / 100 * (len(ms) - 1))))]
+
+    return {
+        "n": len(ms),
+        "p50_ms": round(pct(50), 4),
+        "p95_ms": round(pct(95), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "min_ms": round(ms[0], 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+def measure(fn, repeat: int, setup=None, warmup: int = 1) -> dict:
+    """setup() 은 측정에서 빼고, fn() 만 repeat 번 잰다."""
+    for _ in range(warmup):
+        if setup: setup()
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup: setup()
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return summarize(samples)
+
+def log(msg):
+    print(msg, file=sys.stderr, flush=True)
+
+
+# ========= 앱 (AppTest) =========
+def _find(widgets, label_prefix):
+    for w in widgets:
+        if w.label.startswith(label_prefix):
+            return w
+    raise LookupError(label_prefix)
+
+def _run_with_editor_selection(at, rows, click=None):
+    """AppTest 는 data_editor 편집을 지원하지 않으므로 편집 상태를 직접 실어 보낸다."""
+    editor = at.dataframe[0]
+    if click is not None:
+        click.click()
+    ws = at._tree.get_widget_states()
+    w = ws.widgets.add()
+    w.id = editor.proto.id
+    w.string_value = json.dumps({
+        "edited_rows": {str(r): {"선택": True} for r in rows}, "added_rows": [], "deleted_rows": [],
+    })
+    return at._run(ws)
+
+def _fragment_ids(at) -> dict:
+    """영역 이름 → 프래그먼트 id. 각 프래그먼트를 한 번씩 단독 실행해 렌더 횟수가 오른 영역으로 찾는다."""
+    ids = {}
+    for fid in list(at._fragment_storage._fragments):
+        before = dict(at.session_state["render_counts"])
+        _run_fragment(at, fid)
+        after = at.session_state["render_counts"]
+        changed = [k for k in after if after[k] != before.get(k)]
+        if len(changed) == 1:
+            ids[changed[0]] = fid
+    return ids
+
+def _run_fragment(at, fragment_id):
+    """브라우저가 프래그먼트 안에서 상호작용했을 때처럼 해당 프래그먼트만 다시 실행한다."""
+    import streamlit.testing.v1.local_script_runner as lsr
+    orig = lsr.RerunData
+    lsr.RerunData = lambda **kw: orig(fragment_id_queue=[fragment_id], is_fragment_scoped_rerun=True, **kw)
+    try:
+        return at.run()
+    finally:
+        lsr.RerunData = orig
+
+def _payload(at) -> dict:
+    """직전 실행에서 브라우저로 보낸 메시지 크기 (render.PayloadMeter 기록)."""
+    run = at.session_state["payload_meter"].current
+    return {"bytes": run["bytes"], "msgs": run["msgs"]}
+
+def bench_app(repeat: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    main_py = str(ROOT / "main.py")
+    new_app = lambda: AppTest.from_file(main_py, default_timeout=60)
+    res = {}
+
+    log("app: cold start")
+    res["cold_first_run"] = measure(lambda: new_app().run(), max(3, repeat // 5), warmup=0)
+
+    at = new_app().run()
+    res["idle_rerun"] = measure(lambda: at.run(), repeat)
+    res["idle_rerun"]["payload"] = _payload(at)
+
+    log("app: form submit")
+    res["form_submit"] = measure(lambda: _find(at.button, "✅ ③").click().run(), repeat)
+    res["form_submit"]["payload"] = _payload(at)
+
+    log("app: contact submit")
+    _find(at.checkbox, "✅ 개인정보").check().run()
+
+    phones = iter(range(10_000_000))
+
+    def fill_contact():
+        # 같은 번호는 중복 신청으로 저장되지 않으므로 매번 다른 번호를 쓴다.
+        _find(at.text_input, "이름").input("홍길동")
+        _find(at.text_input, "연락처").input(f"010-{next(phones):08d}")
+    res["contact_submit"] = measure(lambda: _find(at.button, "📩").click().run(), repeat, setup=fill_contact)
+
+    log("app: admin login")
+    pin = lambda: _find(at.text_input, "관리자 PIN")
+    res["admin_login"] = measure(
+        lambda: pin().input(ADMIN_PIN).run(), repeat, setup=lambda: pin().input("").run(),
+    )
+
+    # 관리자 영역만 단독 rerun: 다른 영역이 다시 그려지지 않는지 렌더 횟수로 확인한다.
+    log("app: admin fragment rerun")
+    frag = _fragment_ids(at)
+    if "관리자" in frag:
+        before = dict(at.session_state["render_counts"])
+        res["admin_fragment_rerun"] = measure(lambda: _run_fragment(at, frag["관리자"]), repeat)
+        after = dict(at.session_state["render_counts"])
+        res["admin_fragment_rerun"]["render_delta"] = {k: after[k] - before.get(k, 0) for k in after}
+        res["admin_fragment_rerun"]["payload"] = _payload(at)
+    if "진단" in frag:
+        # 브라우저에서의 실제 제출: 진단 프래그먼트만 실행되고 결과 영역만 전송된다.
+        at.run()
+        res["form_submit_fragment"] = measure(lambda: (_find(at.button, "✅ ③").click(), _run_fragment(at, frag["진단"])), repeat)
+        res["form_submit_fragment"]["payload"] = _payload(at)
+    at.run()  # 프래그먼트 단독 실행 결과 트리에는 다른 영역이 없으므로 전체를 다시 그린다.
+
+    log("app: delete")
+    select = lambda: _run_with_editor_selection(at, [0])
+    res["delete_selected"] = measure(
+        lambda: _run_with_editor_selection(at, [0], click=_find(at.button, "🗑️")),
+        repeat, setup=lambda: (fill_contact(), _find(at.button, "📩").click().run(), pin().input(ADMIN_PIN).run(), select()),
+    )
+
+    log("app: wipe")
+    res["wipe"] = measure(
+        lambda: _find(at.button, "🧹").click().run(),
+        repeat, setup=lambda: (fill_contact(), _find(at.button, "📩").click().run(), pin().input(ADMIN_PIN).run()),
+    )
+    return res
+
+
+# ========= 판정 =========
+def _random_applicants(n: int, seed: int = 0):
+    import numpy as np
+    import pandas as pd
+    from eligibility import FLAG_COLUMNS
+
+    rng = np.random.default_rng(seed)
+    sectors = np.array(["부동산 임대업", "서비스업", "소매업", "음식점업", "도매업", "제조업", "건설업", "광업", "기타업종"])
+    df = pd.DataFrame({
+        "birth": pd.Timestamp("1950-01-01") + pd.to_timedelta(rng.integers(0, 27_000, n), unit="D"),
+        "biz_start": pd.Timestamp("2018-01-01") + pd.to_timedelta(rng.integers(0, 3_000, n), unit="D"),
+        "sales": rng.integers(0, 300, n) * 1_000_000,
+        "credit_nice": rng.integers(400, 950, n),
+        "credit_kcb": rng.integers(400, 950, n),
+        "employees": rng.integers(0, 15, n),
+        "biz_sector": sectors[rng.integers(0, len(sectors), n)],
+    })
+    for f in FLAG_COLUMNS:
+        df[f] = rng.random(n) < 0.1
+    return df
+
+def bench_eligibility(repeat: int, sizes) -> dict:
+    from eligibility import evaluate_batch, match_funds, rejection_reasons
+
+    app = {
+        "birth": date(1980, 1, 1), "biz_start": date(2024, 1, 1), "sales": 100_000_000,
+        "credit_nice": 700, "credit_kcb": 680, "employees": 0, "biz_sector": "소매업",
+    }
+    res = {}
+    inner = 1000
+    log("eligibility: single")
+    res["match_funds_x1000"] = measure(lambda: [match_funds(app) for _ in range(inner)], repeat)
+    res["rejection_reasons_x1000"] = measure(lambda: [rejection_reasons(app) for _ in range(inner)], repeat)
+    for n in sizes:
+        log(f"eligibility: batch {n:,}")
+        df = _random_applicants(n)
+        res[f"evaluate_batch_{n}"] = measure(lambda: evaluate_batch(df), max(3, repeat // 10))
+    return res
+
+
+# ========= 저장소 =========
+def _fill_store(backend: str, directory: Path, n: int):
+    import pandas as pd
+    from contact_store import (
+        COLUMNS, ID_COLUMN, CsvContactStore, PartitionedContactStore, SqliteContactStore, new_contact_id,
+    )
+
+    rows = pd.DataFrame({
+        "이름": [f"고객{i}" for i in range(n)],
+        "연락처": [f"010{i:08d}" for i in range(n)],
+        "메모": "벤치마크",
+        "신청일": "2025-01-01",
+    }, columns=COLUMNS)
+    if backend == "partitioned":
+        # 최근 24개 달에 고르게 나눈다 (오래된 행부터).
+        months = pd.period_range(end=pd.Timestamp.today(), periods=24, freq="M")
+        rows["신청일"] = [f"{months[i * 24 // n]}-01" for i in range(n)]
+        store = PartitionedContactStore(directory / f"contacts_{n}", "sqlite")
+        store.append_many(rows.itertuples(index=False, name=None))
+        return store
+    if backend == "csv":
+        path = directory / f"contacts_{n}.csv"
+        rows.insert(0, ID_COLUMN, [new_contact_id() for _ in range(n)])
+        rows.to_csv(path, index=False, encoding="utf-8")
+        return CsvContactStore(path)
+    store = SqliteContactStore(directory / f"contacts_{n}.db")
+    store.append_many(rows.itertuples(index=False, name=None))
+    return store
+
+def bench_store(repeat: int, sizes, directory: Path) -> dict:
+    import contact_store
+
+    res = {}
+    for backend in ("csv", "sqlite", "partitioned"):
+        for n in sizes:
+            log(f"store: {backend} {n:,}")
+            store = _fill_store(backend, directory, n)
+            cold = lambda: contact_store._CSV_CACHE.clear()
+            slow = max(3, repeat // 10) if n >= 100_000 else repeat
+            res[f"{backend}_{n}_load_df_cold"] = measure(store.load_df, slow, setup=cold)
+            res[f"{backend}_{n}_load_df_warm"] = measure(store.load_df, repeat)
+            res[f"{backend}_{n}_append"] = measure(lambda: store.append("홍길동", "010-1234-5678", "메모"), repeat)
+            res[f"{backend}_{n}_page"] = measure(lambda: store.page(50, 0), repeat)
+            res[f"{backend}_{n}_count"] = measure(store.count, repeat)
+            victim = []
+            res[f"{backend}_{n}_delete_1"] = measure(
+                lambda: store.delete(victim[-1:]), repeat, setup=lambda: victim.append(store.page(1).index[0]),
+            )
+            # 보관 기간 파기 1회: 단일 파일은 전부(신청일 2025-01-01) 행 단위로, 파티션은 오래된 12개 달 파일째
+            res[f"{backend}_{n}_purge"] = measure(
+                lambda: store.purge(contact_store.retention_cutoff(12)), 1, warmup=0,
+            )
+    return res
+
+
+# ========= 콜드 스타트 =========
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow")
+FORM_FILL_SECONDS = 1.0  # 첫 화면이 뜬 뒤 제출까지 사용자가 입력하는 시간 (이 사이 What-if 를 미리 불러 둔다)
+_APP_IMPORTS = "import streamlit, metrics, render, contact_store, lead_stats, eligibility, export"
+_FIRST_REQUEST = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+heavy = lambda: [m for m in sys.argv[3:] if m in sys.modules]
+t = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=60).run()
+first_run, after_run = time.perf_counter() - t, heavy()
+time.sleep(float(sys.argv[2]))
+t = time.perf_counter()
+next(b for b in at.button if b.label.startswith("✅ ③")).click().run()
+print(json.dumps({"first_run": first_run, "first_submit": time.perf_counter() - t,
+                  "heavy_after_run": after_run, "heavy_after_submit": heavy()}))
+"""
+
+def _importtime(code: str, top: int = 10) -> dict:
+    """python -X importtime 출력 요약: 전체(ms), 누적 시간 상위 최상위 모듈, 불러온 무거운 모듈."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    roots, names = {}, set()
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package" (하위 모듈은 이름 앞 들여쓰기)
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2][1:]
+        names.add(name.strip())
+        if not name.startswith(" "):
+            roots[name] = int(parts[1]) / 1000
+    ranked = sorted(roots.items(), key=lambda kv: kv[1], reverse=True)
+    return {
+        "total_ms": round(sum(roots.values()), 1),
+        "top_ms": {name: round(ms, 1) for name, ms in ranked[:top]},
+        "heavy_loaded": [m for m in HEAVY_MODULES if m in names],
+    }
+
+def bench_startup(repeat: int) -> dict:
+    res = {}
+    runs = max(3, repeat // 5)
+    for name, code in (("python_startup", "pass"), ("import_app_modules", _APP_IMPORTS)):
+        log(f"startup: {name}")
+        res[name] = measure(lambda: subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True), runs)
+    res["import_app_modules"]["importtime"] = _importtime(_APP_IMPORTS)
+
+    log("startup: first request (새 프로세스)")
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-c", _FIRST_REQUEST, str(ROOT / "main.py"), str(FORM_FILL_SECONDS),
+                               *HEAVY_MODULES],
+                              cwd=ROOT, capture_output=True, text=True, check=True)
+        samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    res["first_run"] = summarize([s["first_run"] for s in samples])
+    # 첫 실행 끝에 What-if(numpy) 백그라운드 preload 가 시작되므로 numpy 가 함께 잡힐 수 있다.
+    res["first_run"]["heavy_loaded"] = samples[-1]["heavy_after_run"]
+    res["first_submit"] = summarize([s["first_submit"] for s in samples])
+    res["first_submit"]["heavy_loaded"] = samples[-1]["heavy_after_submit"]
+    return res
+
+
+# ========= 실행/저장/비교 =========
+def _meta() -> dict:
+    def version(mod):
+        try:
+            return __import__(mod).__version__
+        except Exception:
+            return None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10,
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "streamlit": version("streamlit"),
+        "pandas": version("pandas"),
+        "numpy": version("numpy"),
+        "contact_backend": os.environ.get("CONTACT_BACKEND", "sqlite"),
+    }
+
+def compare(current: dict, baseline: dict):
+    print(f"{'항목':<48}{'기준 p50':>12}{'현재 p50':>12}{'비율':>8}")
+    for section, items in current["results"].items():
+        for name, stats in items.items():
+            old = baseline.get("results", {}).get(section, {}).get(name)
+            if not old:
+                continue
+            ratio = stats["p50_ms"] / old["p50_ms"] if old["p50_ms"] else float("nan")
+            flag = "  ▲" if ratio > 1.1 else ("  ▼" if ratio < 0.9 else "")
+            print(f"{section + '.' + name:<48}{old['p50_ms']:>12.3f}{stats['p50_ms']:>12.3f}{ratio:>8.2f}{flag}")
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="정책자금 앱 성능 벤치마크")
+    p.add_argument("--out", default="bench_results.json")
+    p.add_argument("--repeat", type=int, default=30)
+    p.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    p.add_argument("--only", nargs="+", choices=["app", "eligibility", "store", "startup"])
+    p.add_argument("--quick", action="store_true", help="repeat 10, sizes 1k/10k")
+    p.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = p.parse_args(argv)
+    if args.quick:
+        args.repeat, args.sizes = 10, [1_000, 10_000]
+    sections = args.only or ["app", "eligibility", "store", "startup"]
+
+    sys.path.insert(0, str(ROOT))
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+        # 앱이 실제 contacts 저장소를 건드리지 않도록 임시 폴더를 쓴다.
+        os.environ["APP_DATA_DIR"] = str(Path(tmp) / "app")
+        if "app" in sections:
+            results["app"] = bench_app(args.repeat)
+        if "eligibility" in sections:
+            results["eligibility"] = bench_eligibility(args.repeat, args.sizes)
+        if "store" in sections:
+            results["store"] = bench_store(args.repeat, args.sizes, Path(tmp))
+        if "startup" in sections:
+            results["startup"] = bench_startup(args.repeat)
+
+    out = {"meta": _meta(), "args": {"repeat": args.repeat, "sizes": args.sizes}, "results": results}
+    Path(args.out).write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
+    for section, items in results.items():
+        for name, stats in items.items():
+            log(f"{section}.{name:<40} p50 {stats['p50_ms']:>10.3f} ms   p95 {stats['p95_ms']:>10.3f} ms")
+    log(f"→ {args.out}")
+    if args.compare:
+        compare(out, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,881 @@
+# contact_store.py
+"""
+상담 신청 내역 저장소.
+
+- CsvContactStore   : 기존 contacts.csv 방식 (단일 파일 + 삭제 묘비 파일)
+- SqliteContactStore: SQLite(WAL) + 신청일/연락처 인덱스, 관리자 화면 페이지 조회용
+- PartitionedContactStore: 신청일의 달마다 위 저장소 파일 하나 (contacts/2026-10.db). 보관 기간이
+  지난 달은 파일째 지우고(purge), 조회는 요청한 기간에 걸친 달의 파일만 연다.
+
+두 저장소 모두 같은 메서드를 제공하며, 조회 결과 DataFrame 의 index 는 행 id 이다.
+연락처는 저장 시 010-1234-5678 형태로 정규화하고, 숫자만 남긴 키로 중복 신청을 찾는다(find_phone).
+관리자 검색(search)은 이름 1·2글자 조각과 연락처 숫자 4자리 조각 색인으로 후보를 좁힌 뒤 확인한다.
+
+CLI:
+    python contact_store.py migrate --csv contacts.csv --db contacts.db   # 기존 CSV → SQLite 1회 이전
+    python contact_store.py compact --csv contacts.csv                    # CSV 묘비(삭제분) 정리
+    python contact_store.py partition --dir contacts --csv contacts.csv --db contacts.db  # 월별 파티션으로 이전
+    python contact_store.py purge --dir contacts --months 12              # 보관 기간 지난 달 파기
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import os
+import re
+import shutil
+import sys
+import threading
+import uuid
+from datetime import date
+from pathlib import Path
+
+from lazy import lazy_module
+from sqlite_tx import transaction
+
+pd = lazy_module("pandas")  # 관리자 조회·이전에서만 쓴다 (상담 신청·중복 확인은 pandas 없이 동작)
+
+COLUMNS = ["이름", "연락처", "메모", "신청일"]
+
+
+# ========= 연락처 정규화 / 검색 색인 =========
+_NON_DIGIT = re.compile(r"[^0-9]")
+
+def phone_key(raw) -> str:
+    """연락처 → 비교용 숫자열. +82 국가번호는 0 으로, 엑셀에서 빠진 휴대폰 맨 앞 0 은 되살린다."""
+    digits = _NON_DIGIT.sub("", str(raw))
+    if digits.startswith("82") and len(digits) >= 9:
+        digits = "0" + digits[2:]
+    elif len(digits) == 10 and digits[:2] in ("10", "11", "16", "17", "18", "19"):
+        digits = "0" + digits
+    return digits
+
+def normalize_phone(raw) -> str:
+    """저장용 표기 (010-1234-5678, 02-123-4567, 1588-1234). 알 수 없는 형식은 입력 그대로."""
+    d = phone_key(raw)
+    if d.startswith("02") and len(d) in (9, 10):
+        return f"02-{d[2:-4]}-{d[-4:]}"
+    if d.startswith("0") and len(d) in (10, 11):
+        return f"{d[:3]}-{d[3:-4]}-{d[-4:]}"
+    if d.startswith("1") and len(d) == 8:
+        return f"{d[:4]}-{d[4:]}"
+    return str(raw).strip()
+
+def _name_norm(name) -> str:
+    return "".join(str(name).split()).lower()
+
+_PHONE_GRAM = 4
+
+def _phone_grams(key: str) -> set:
+    """연락처 키의 연속 숫자 4자리 조각 ("#" 접두). 앞·가운데·뒷자리 어디로 검색해도 걸린다."""
+    return {"#" + key[i:i + _PHONE_GRAM] for i in range(len(key) - _PHONE_GRAM + 1)}
+
+def search_grams(name, phone) -> set:
+    """행 색인 조각: 이름의 1글자·2글자 조각 + 연락처 숫자 4자리 조각."""
+    n = _name_norm(name)
+    return set(n) | {n[i:i + 2] for i in range(len(n) - 1)} | _phone_grams(phone_key(phone))
+
+def _like_pattern(needle: str) -> str:
+    """SQL LIKE 부분 일치 패턴 (ESCAPE '\\')."""
+    return "%" + needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+def _query_grams(query: str):
+    """검색어 → (찾을 조각 집합, 확인 함수 인자). 숫자 4자리 이상이면 연락처, 아니면 이름 검색."""
+    if not any(ch.isalpha() for ch in query):
+        # 앞자리 0 을 되살리는 phone_key 는 번호 전체용이므로, 검색어는 입력한 숫자 그대로 찾는다
+        # (단, +82 로 시작하면 0 으로 바꾼다).
+        digits = _NON_DIGIT.sub("", query)
+        if query.lstrip().startswith("+82"):
+            digits = "0" + digits[2:]
+        if len(digits) >= _PHONE_GRAM:
+            return _phone_grams(digits), ("phone", digits)
+    n = _name_norm(query)
+    return (set(n) if len(n) == 1 else {n[i:i + 2] for i in range(len(n) - 1)}), ("name", n)
+
+
+def _empty_df() -> pd.DataFrame:
+    return pd.DataFrame(columns=COLUMNS)
+
+
+class ContactStore:
+    """저장소 공통 인터페이스."""
+    location = ""
+
+    def append(self, name, phone, memo):
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def page(self, limit: int, offset: int = 0) -> pd.DataFrame:
+        """최근 신청 순으로 limit 건 (index = 행 id)."""
+        raise NotImplementedError
+
+    def load_df(self) -> pd.DataFrame:
+        """전체 내역 (신청 순)."""
+        raise NotImplementedError
+
+    def iter_chunks(self, start: str | None = None, end: str | None = None, chunksize: int = 10_000):
+        """신청일(YYYY-MM-DD)이 [start, end] 인 행을 chunksize 행씩 DataFrame(COLUMNS)으로 내보낸다."""
+        raise NotImplementedError
+
+    def find_phone(self, phone, since: str | None = None) -> list:
+        """같은 연락처(정규화 키 기준)로 신청일 since 이후 저장된 행의 [(id, 신청일)] (신청 순)."""
+        raise NotImplementedError
+
+    def search(self, query: str, limit: int = 50) -> pd.DataFrame:
+        """이름 일부 또는 연락처 일부(연속 숫자 4자리 이상, 앞·가운데·뒷자리 모두) 검색, 최근 신청 순 limit 건."""
+        raise NotImplementedError
+
+    def delete(self, ids) -> int:
+        raise NotImplementedError
+
+    def purge(self, before: str) -> int:
+        """신청일이 before(YYYY-MM-DD) 이전인 행을 실제로 지운다 (보관 기간 파기). 지운 행 수를 돌려준다."""
+        raise NotImplementedError
+
+    def wipe(self):
+        raise NotImplementedError
+
+
+# ========= CSV =========
+# 행마다 고유 ID 를 붙여 저장하고, 삭제는 ID 를 묘비(tombstone) 파일(contacts.csv.deleted)에
+# 한 줄씩 덧붙이는 것으로 끝낸다. 조회 시 묘비를 걸러내고, 묘비 비율이 compact_ratio 를
+# 넘으면 그때만 CSV 를 다시 쓴다(compaction).
+#
+# 프로세스 전역 캐시: 경로 → 파일 크기/mtime/앞부분 바이트/DataFrame, 연락처·검색 색인, 묘비 ID 집합.
+# 파일이 뒤로만 늘어났으면 늘어난 꼬리 바이트만 읽어 붙인다 (셋 모두 _read_lines 로 읽는다).
+# 예전 cp949 파일은 처음 열 때 _upgrade_legacy 가 UTF-8 로 다시 쓰므로 이후로는 UTF-8 만 읽는다.
+ID_COLUMN = "ID"
+CSV_HEADER = [ID_COLUMN] + COLUMNS
+DEFAULT_COMPACT_RATIO = 0.2
+
+_CSV_CACHE = {}
+_CSV_CACHE_LOCK = threading.Lock()
+_HEAD_BYTES = 64
+
+
+def new_contact_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+def _read_lines(path, start: int = 0) -> tuple:
+    """
+    (앞부분 바이트, start 이후 마지막 줄바꿈까지의 바이트). 파일 크기를 따로 재지 않고 읽은 만큼만 쓰므로,
+    그 사이 덧붙은 행이나 쓰는 중인 마지막 줄은 다음 조회의 꼬리로 넘어간다 (호출 측은 len(반환값) 만큼 전진).
+    """
+    with open(path, "rb") as f:
+        head = f.read(_HEAD_BYTES)
+        f.seek(start)
+        data = f.read()
+    return head, data[:data.rfind(b"\n") + 1]
+
+
+class _MemoryIndex:
+    """
+    CSV 저장소용 메모리 색인: 연락처 키 → [행 위치], 검색 조각 → [행 위치] (오름차순).
+    pandas 없이 csv 모듈로 읽고, 파일이 뒤로 늘어나면 읽은 바이트(size) 뒤의 꼬리만 더한다.
+    묘비는 조회 때 거른다. 행 위치별 ID·신청일·정규화 이름·연락처 키도 함께 둔다.
+    """
+
+    def __init__(self, head: bytes = b""):
+        self.size = 0
+        self.head = head
+        self.ids, self.days, self.names, self.keys = [], [], [], []
+        self.phones = {}
+        self.grams = {}
+
+    def add_rows(self, rows):
+        """rows: CSV_HEADER 순서의 행 목록 (빈 줄은 건너뜀)."""
+        for row in rows:
+            if len(row) < len(CSV_HEADER):
+                continue
+            row_id, name, phone, _, day = row[:5]
+            pos, key = len(self.ids), phone_key(phone)
+            self.ids.append(row_id)
+            self.days.append(day)
+            self.names.append(_name_norm(name))
+            self.keys.append(key)
+            self.phones.setdefault(key, []).append(pos)
+            for g in search_grams(name, phone):
+                self.grams.setdefault(g, []).append(pos)
+
+
+class CsvContactStore(ContactStore):
+    def __init__(self, path, compact_ratio: float = DEFAULT_COMPACT_RATIO):
+        self.path = Path(path)
+        self.tomb_path = self.path.with_name(self.path.name + ".deleted")
+        self.location = str(self.path)
+        self.compact_ratio = compact_ratio
+
+    def _invalidate(self):
+        with _CSV_CACHE_LOCK:
+            _CSV_CACHE.pop(self.path, None)
+            _CSV_CACHE.pop(self.tomb_path, None)
+            _CSV_CACHE.pop(("index", self.path), None)
+
+    def append(self, name, phone, memo):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file_exists = self.path.exists()
+        if file_exists:
+            self._upgrade_legacy()
+        with self.path.open("a", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            if not file_exists:
+                w.writerow(CSV_HEADER)
+            w.writerow([new_contact_id(), name, normalize_phone(phone), memo, date.today().isoformat()])
+        # 기존 파일 뒤에 붙인 경우는 다음 조회 때 꼬리만 읽으면 되므로 캐시를 유지한다.
+        if not file_exists:
+            self._invalidate()
+
+    def append_many(self, rows):
+        """(이름, 연락처, 메모, 신청일) 튜플 목록을 한 번에 덧붙인다 (이전용)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file_exists = self.path.exists()
+        if file_exists:
+            self._upgrade_legacy()
+        with self.path.open("a", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            if not file_exists:
+                w.writerow(CSV_HEADER)
+            w.writerows([new_contact_id(), name, normalize_phone(phone), memo, applied_on]
+                        for name, phone, memo, applied_on in rows)
+        if not file_exists:
+            self._invalidate()
+
+    # ----- 읽기 -----
+    @staticmethod
+    def _read_full(data: bytes) -> pd.DataFrame:
+        return pd.read_csv(io.BytesIO(data), encoding="utf-8", dtype=str, keep_default_na=False).set_index(ID_COLUMN)
+
+    def _upgrade_legacy(self):
+        """ID 컬럼이 없는 예전 contacts.csv 면 한 번만 ID 를 붙이고 연락처를 정규화해 다시 쓴다 (SQLite 업그레이드와 같게)."""
+        with self.path.open("rb") as f:
+            first = f.readline().decode("utf-8-sig", errors="replace")
+        if first.split(",")[0].strip() == ID_COLUMN:
+            return
+        try:
+            df = pd.read_csv(self.path, encoding="utf-8", dtype=str, keep_default_na=False)
+        except UnicodeDecodeError:
+            df = pd.read_csv(self.path, encoding="cp949", dtype=str, keep_default_na=False)
+        df.insert(0, ID_COLUMN, [new_contact_id() for _ in range(len(df))])
+        if "연락처" in df.columns:
+            df["연락처"] = df["연락처"].map(normalize_phone)
+        self._rewrite(df.set_index(ID_COLUMN))
+
+    def _rewrite(self, df: pd.DataFrame):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        df.reset_index().reindex(columns=CSV_HEADER).to_csv(tmp, index=False, encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._invalidate()
+
+    def _raw_df(self) -> pd.DataFrame:
+        """묘비를 거르기 전의 전체 행 (index = ID)."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            self._invalidate()
+            return _empty_df()
+
+        with _CSV_CACHE_LOCK:
+            cached = _CSV_CACHE.get(self.path)
+            if cached and (cached["size"], cached["mtime"]) == (st.st_size, st.st_mtime_ns):
+                return cached["df"]
+
+            if cached and st.st_size >= cached["size"]:
+                head, tail = _read_lines(self.path, cached["size"])
+                if head == cached["head"]:
+                    df = cached["df"]
+                    if tail:
+                        new = self._read_tail(tail)
+                        # 이미 읽은 ID 는 다시 붙이지 않는다 (큰 쪽에서 작은 꼬리의 ID 를 찾아야 빠르다)
+                        seen = df.index[df.index.isin(new.index)]
+                        if len(seen):
+                            new = new[~new.index.isin(seen)]
+                        df = pd.concat([df, new]) if len(df) else new
+                    size = cached["size"] + len(tail)
+                    cached.update(size=size, df=df, mtime=st.st_mtime_ns if size == st.st_size else None)
+                    return df
+
+        self._upgrade_legacy()
+        with _CSV_CACHE_LOCK:
+            # 읽은 바이트(마지막 줄바꿈까지)만 파싱하고 그 길이를 size 로 둔다. mtime 은 다음 조회의 꼬리 확인에서 채운다.
+            head, data = _read_lines(self.path)
+            df = self._read_full(data)
+            _CSV_CACHE[self.path] = {"size": len(data), "mtime": None, "head": head, "df": df}
+            return df
+
+    @staticmethod
+    def _read_tail(tail: bytes) -> pd.DataFrame:
+        return pd.read_csv(
+            io.BytesIO(tail), header=None, names=CSV_HEADER, encoding="utf-8", dtype=str, keep_default_na=False,
+        ).set_index(ID_COLUMN)
+
+    def _index(self) -> _MemoryIndex:
+        """
+        연락처·검색 색인 (상담 신청 중복 확인용이라 pandas 를 쓰지 않는다).
+        처음 찾을 때 만들고, 이후에는 파일이 뒤로 늘어난 꼬리만 더 읽는다.
+        """
+        key = ("index", self.path)
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return _MemoryIndex()
+        if key not in _CSV_CACHE:
+            self._upgrade_legacy()
+        with _CSV_CACHE_LOCK:
+            index = _CSV_CACHE.get(key)
+            if index is not None and st.st_size >= index.size:
+                head, tail = _read_lines(self.path, index.size)
+                if head == index.head:
+                    index.add_rows(csv.reader(io.StringIO(tail.decode("utf-8"))))
+                    index.size += len(tail)
+                    return index
+            head, data = _read_lines(self.path)
+            index = _CSV_CACHE[key] = _MemoryIndex(head)
+            rows = csv.reader(io.StringIO(data.decode("utf-8-sig")))
+            next(rows, None)  # 머리글
+            index.add_rows(rows)
+            index.size = len(data)
+            return index
+
+    def _tombstones(self) -> set:
+        """삭제된 ID 집합. 묘비 파일도 뒤로만 늘어나므로 꼬리만 읽는다."""
+        try:
+            st = self.tomb_path.stat()
+        except FileNotFoundError:
+            with _CSV_CACHE_LOCK:
+                _CSV_CACHE.pop(self.tomb_path, None)
+            return set()
+        with _CSV_CACHE_LOCK:
+            cached = _CSV_CACHE.get(self.tomb_path)
+            if not cached or st.st_size < cached["size"]:
+                cached = _CSV_CACHE[self.tomb_path] = {"size": 0, "ids": set()}
+            if st.st_size > cached["size"]:
+                _, tail = _read_lines(self.tomb_path, cached["size"])
+                cached["ids"] = cached["ids"] | set(tail.decode("ascii").split())
+                cached["size"] += len(tail)
+            return cached["ids"]
+
+    def load_df(self) -> pd.DataFrame:
+        """삭제분을 뺀 전체 내역 (index = ID). 캐시된 DataFrame 이므로 호출 측에서 수정하지 않는다."""
+        raw = self._raw_df()
+        dead = self._tombstones()
+        if not dead:
+            return raw
+        with _CSV_CACHE_LOCK:
+            cached = _CSV_CACHE.get(self.path)
+            key = (cached and cached["size"], len(dead))
+            if cached is not None and cached.get("view_key") == key:
+                return cached["view"]
+            view = raw[~raw.index.isin(dead)]
+            if cached is not None:
+                cached.update(view_key=key, view=view)
+            return view
+
+    def count(self) -> int:
+        # 묘비는 파일에 있는 ID 만 기록하므로 (전체 행 - 묘비) 이다.
+        return len(self._index().ids) - len(self._tombstones())
+
+    def page(self, limit: int, offset: int = 0) -> pd.DataFrame:
+        # CSV 는 위치 기반 조회가 불가능하므로 (캐시된) 전체에서 자른다.
+        return self.load_df().iloc[::-1].iloc[offset:offset + limit]
+
+    def iter_chunks(self, start: str | None = None, end: str | None = None, chunksize: int = 10_000):
+        # 캐시된 전체 DataFrame 이 아니라 파일에서 직접 조금씩 읽는다.
+        if not self.path.exists():
+            return
+        self._upgrade_legacy()
+        dead = self._tombstones()
+        for chunk in pd.read_csv(self.path, encoding="utf-8", dtype=str, keep_default_na=False, chunksize=chunksize):
+            mask = ~chunk[ID_COLUMN].isin(dead)
+            if start:
+                mask &= chunk["신청일"] >= start
+            if end:
+                mask &= chunk["신청일"] <= end
+            chunk = chunk.loc[mask, COLUMNS]
+            if len(chunk):
+                yield chunk
+
+    # ----- 중복 확인 / 검색 -----
+    def find_phone(self, phone, since: str | None = None) -> list:
+        index = self._index()
+        dead = self._tombstones()
+        return [(index.ids[p], index.days[p]) for p in index.phones.get(phone_key(phone), ())
+                if index.ids[p] not in dead and (not since or index.days[p] >= since)]
+
+    def search(self, query: str, limit: int = 50) -> pd.DataFrame:
+        grams, (kind, needle) = _query_grams(query)
+        if not grams:
+            return _empty_df()
+        index = self._index()
+        dead = self._tombstones()
+        # 가장 드문 조각의 행만 최근 순으로 훑으며 부분 일치를 확인한다 (일치하면 나머지 조각도 들어 있음).
+        driver = min((index.grams.get(g, []) for g in grams), key=len)
+        values = index.keys if kind == "phone" else index.names
+        hits = []
+        for p in reversed(driver):
+            if needle in values[p] and index.ids[p] not in dead:
+                hits.append(index.ids[p])
+                if len(hits) >= limit:
+                    break
+        raw = self._raw_df()
+        return raw.loc[[i for i in hits if i in raw.index]]
+
+    # ----- 삭제 -----
+    def delete(self, ids) -> int:
+        """ID 를 묘비 파일에 덧붙인다 (삭제 건수에 비례하는 비용). 필요하면 compaction 한다."""
+        raw, dead = self._raw_df().index, self._tombstones()
+        ids = [str(i) for i in ids if str(i) in raw and str(i) not in dead]
+        if not ids:
+            return 0
+        with self.tomb_path.open("a", encoding="ascii") as f:
+            f.write("".join(f"{i}\n" for i in ids))
+        if self.tombstone_ratio() > self.compact_ratio:
+            self.compact()
+        return len(ids)
+
+    def purge(self, before: str) -> int:
+        """묘비로 두지 않고 파일을 다시 써서 실제로 지운다 (지울 행이 있을 때만)."""
+        index, dead = self._index(), self._tombstones()
+        expired = [i for i, day in zip(index.ids, index.days) if day < before and i not in dead]
+        if not expired:
+            return 0
+        with self.tomb_path.open("a", encoding="ascii") as f:
+            f.write("".join(f"{i}\n" for i in expired))
+        self.compact()
+        return len(expired)
+
+    def tombstone_ratio(self) -> float:
+        total = len(self._raw_df())
+        return len(self._tombstones()) / total if total else 0.0
+
+    def compact(self) -> int:
+        """묘비 처리된 행을 실제로 지우고 CSV 를 다시 쓴다. 제거한 행 수를 돌려준다."""
+        dead = self._tombstones()
+        if not dead:
+            return 0
+        raw = self._raw_df()
+        live = raw[~raw.index.isin(dead)]
+        self._rewrite(live)
+        self.tomb_path.unlink(missing_ok=True)
+        self._invalidate()
+        return len(raw) - len(live)
+
+    def wipe(self):
+        self.path.unlink(missing_ok=True)
+        self.tomb_path.unlink(missing_ok=True)
+        self._invalidate()
+
+
+# ========= SQLite (WAL) =========
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    name       TEXT NOT NULL,
+    phone      TEXT NOT NULL,
+    memo       TEXT NOT NULL DEFAULT '',
+    applied_on TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_applied_on ON contacts(applied_on);
+CREATE INDEX IF NOT EXISTS idx_contacts_phone ON contacts(phone);
+CREATE TABLE IF NOT EXISTS contact_grams (
+    gram TEXT NOT NULL,
+    id   INTEGER NOT NULL,
+    PRIMARY KEY (gram, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_contact_grams_id ON contact_grams(id);
+"""
+_SCHEMA_VERSION = 2  # 1: phone_key 컬럼 + contact_grams 검색 색인, 2: 연락처 색인을 숫자 4자리 조각 전체로
+_GRAM_PROBE = 5_000
+_SELECT = "SELECT id, name AS 이름, phone AS 연락처, memo AS 메모, applied_on AS 신청일 FROM contacts"
+
+
+class SqliteContactStore(ContactStore):
+    def __init__(self, path):
+        self.path = Path(path)
+        self.location = str(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._tx() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_SCHEMA)
+            if con.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                self._upgrade_schema(con)
+
+    @staticmethod
+    def _upgrade_schema(con):
+        """예전 DB: 연락처 정규화 + phone_key 채우기 + 검색 색인 만들기 (1회)."""
+        cols = {row[1] for row in con.execute("PRAGMA table_info(contacts)")}
+        if "phone_key" not in cols:
+            con.execute("ALTER TABLE contacts ADD COLUMN phone_key TEXT NOT NULL DEFAULT ''")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_contacts_phone_key ON contacts(phone_key)")
+        rows = con.execute("SELECT id, name, phone FROM contacts").fetchall()
+        con.executemany("UPDATE contacts SET phone = ?, phone_key = ? WHERE id = ?",
+                        [(normalize_phone(phone), phone_key(phone), i) for i, _, phone in rows])
+        con.execute("DELETE FROM contact_grams")
+        con.executemany("INSERT INTO contact_grams(gram, id) VALUES (?, ?)",
+                        [(g, i) for i, name, phone in rows for g in search_grams(name, phone)])
+        con.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def _tx(self):
+        # 지운 행(이름·연락처)이 빈 페이지에 남지 않도록 secure_delete 로 연다.
+        return transaction(self.path, secure_delete=True)
+
+    def _query_df(self, sql, params=()) -> pd.DataFrame:
+        with self._tx() as con:
+            df = pd.read_sql_query(sql, con, params=params, index_col="id")
+        return df if len(df) else _empty_df()
+
+    def append(self, name, phone, memo):
+        self.append_many([(name, phone, memo or "", date.today().isoformat())])
+
+    def append_many(self, rows):
+        """(이름, 연락처, 메모, 신청일) 튜플 목록을 한 트랜잭션으로 넣는다 (연락처 정규화 + 검색 색인)."""
+        grams = []
+        with self._tx() as con:
+            for name, phone, memo, applied_on in rows:
+                cur = con.execute(
+                    "INSERT INTO contacts(name, phone, phone_key, memo, applied_on) VALUES (?, ?, ?, ?, ?)",
+                    (name, normalize_phone(phone), phone_key(phone), memo, applied_on),
+                )
+                grams += [(g, cur.lastrowid) for g in search_grams(name, phone)]
+            # 색인 순서대로 넣어야 대량 이전이 빠르다.
+            con.executemany("INSERT INTO contact_grams(gram, id) VALUES (?, ?)", sorted(grams))
+
+    def count(self) -> int:
+        with self._tx() as con:
+            return con.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def page(self, limit: int, offset: int = 0) -> pd.DataFrame:
+        return self._query_df(_SELECT + " ORDER BY id DESC LIMIT ? OFFSET ?", (int(limit), int(offset)))
+
+    def load_df(self) -> pd.DataFrame:
+        return self._query_df(_SELECT + " ORDER BY id")
+
+    def iter_chunks(self, start: str | None = None, end: str | None = None, chunksize: int = 10_000):
+        sql = "SELECT name AS 이름, phone AS 연락처, memo AS 메모, applied_on AS 신청일 FROM contacts WHERE 1=1"
+        params = []
+        if start:
+            sql += " AND applied_on >= ?"
+            params.append(start)
+        if end:
+            sql += " AND applied_on <= ?"
+            params.append(end)
+        with self._tx() as con:
+            yield from pd.read_sql_query(sql + " ORDER BY id", con, params=params, chunksize=chunksize)
+
+    def find_phone(self, phone, since: str | None = None) -> list:
+        with self._tx() as con:
+            return con.execute(
+                "SELECT id, applied_on FROM contacts WHERE phone_key = ? AND applied_on >= ? ORDER BY id",
+                (phone_key(phone), since or ""),
+            ).fetchall()
+
+    def search(self, query: str, limit: int = 50) -> pd.DataFrame:
+        grams, (kind, needle) = _query_grams(query)
+        if not grams:
+            return _empty_df()
+        column = "c.phone_key" if kind == "phone" else "replace(lower(c.name), ' ', '')"
+        with self._tx() as con:
+            # 가장 드문 조각(최대 _GRAM_PROBE 행까지 세어 봄)의 행만 최근 순으로 훑는다.
+            driver = min(grams, key=lambda g: con.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM contact_grams WHERE gram = ? LIMIT ?)", (g, _GRAM_PROBE),
+            ).fetchone()[0])
+            df = pd.read_sql_query(
+                "SELECT c.id, c.name AS 이름, c.phone AS 연락처, c.memo AS 메모, c.applied_on AS 신청일"
+                " FROM contact_grams g JOIN contacts c ON c.id = g.id"
+                f" WHERE g.gram = ? AND {column} LIKE ? ESCAPE '\\' ORDER BY g.id DESC LIMIT ?",
+                con, params=(driver, _like_pattern(needle), int(limit)), index_col="id",
+            )
+        return df if len(df) else _empty_df()
+
+    def delete(self, ids) -> int:
+        ids = [(int(i),) for i in ids]
+        with self._tx() as con:
+            cur = con.executemany("DELETE FROM contacts WHERE id = ?", ids)
+            n = cur.rowcount
+            con.executemany("DELETE FROM contact_grams WHERE id = ?", ids)
+        return n
+
+    def _checkpoint(self):
+        """WAL 에 남은 지우기 전 페이지 사본까지 본 파일에 반영하고 WAL 을 비운다 (파기 뒤)."""
+        with self._tx() as con:
+            con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def purge(self, before: str) -> int:
+        with self._tx() as con:
+            con.execute("DELETE FROM contact_grams WHERE id IN (SELECT id FROM contacts WHERE applied_on < ?)", (before,))
+            n = con.execute("DELETE FROM contacts WHERE applied_on < ?", (before,)).rowcount
+        if n:
+            self._checkpoint()
+        return n
+
+    def wipe(self):
+        with self._tx() as con:
+            con.execute("DELETE FROM contacts")
+            con.execute("DELETE FROM contact_grams")
+        self._checkpoint()
+
+
+# ========= 월별 파티션 =========
+# 신청일의 연-월(YYYY-MM)마다 하위 저장소 파일을 하나씩 둔다 (contacts/2026-10.db 또는 .csv).
+# 보관 기간 파기는 지난 달 파일을 통째로 지우는 것으로 끝나므로 전체 내역 크기와 무관하고,
+# 기간을 준 조회(iter_chunks·find_phone)와 최근 순 페이지는 필요한 달의 파일만 연다.
+# 행 id 는 "YYYY-MM/하위 저장소 id" 이다.
+PARTITION_SUFFIX = {"sqlite": ".db", "csv": ".csv"}
+
+
+def retention_cutoff(months: int, today: date | None = None) -> str:
+    """이번 달을 포함해 최근 months 개 달만 남길 때의 파기 기준일 (이 날짜 이전 신청분 파기)."""
+    if today is None: today = date.today()
+    y, m = divmod(today.year * 12 + today.month - months, 12)
+    return date(y, m + 1, 1).isoformat()
+
+
+class PartitionedContactStore(ContactStore):
+    def __init__(self, root, backend: str = "sqlite", compact_ratio: float = DEFAULT_COMPACT_RATIO):
+        if backend not in PARTITION_SUFFIX:
+            raise ValueError(f"알 수 없는 저장소: {backend}")
+        self.root = Path(root)
+        self.backend = backend
+        self.suffix = PARTITION_SUFFIX[backend]
+        self.compact_ratio = compact_ratio
+        self.location = str(self.root / f"YYYY-MM{self.suffix}")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def _store(self, month: str) -> ContactStore:
+        with self._lock:
+            store = self._stores.get(month)
+            if store is None:
+                path = self.root / f"{month}{self.suffix}"
+                if self.backend == "sqlite":
+                    store = SqliteContactStore(path)
+                else:
+                    store = CsvContactStore(path, compact_ratio=self.compact_ratio)
+                self._stores[month] = store
+            return store
+
+    def months(self, start: str | None = None, end: str | None = None) -> list:
+        """파일이 있는 달 중 신청일 [start, end] 에 걸친 달 (오래된 순)."""
+        months = sorted(p.name[:7] for p in self.root.glob(f"????-??{self.suffix}"))
+        return [m for m in months if (not start or m >= start[:7]) and (not end or m <= end[:7])]
+
+    @staticmethod
+    def _with_month(month: str, df: pd.DataFrame) -> pd.DataFrame:
+        return df.set_axis(pd.Index([f"{month}/{i}" for i in df.index], name="id"))
+
+    def append(self, name, phone, memo):
+        self._store(date.today().isoformat()[:7]).append(name, phone, memo)
+
+    def append_many(self, rows):
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(row[3][:7], []).append(row)
+        for month, part in by_month.items():
+            self._store(month).append_many(part)
+
+    def count(self) -> int:
+        return sum(self._store(m).count() for m in self.months())
+
+    def page(self, limit: int, offset: int = 0) -> pd.DataFrame:
+        # 최근 달부터 건수만 세어 건너뛰고, 실제로 읽는 것은 페이지에 걸친 달뿐이다.
+        parts = []
+        for month in reversed(self.months()):
+            store = self._store(month)
+            n = store.count()
+            if offset >= n:
+                offset -= n
+                continue
+            df = store.page(limit, offset)
+            parts.append(self._with_month(month, df))
+            limit, offset = limit - len(df), 0
+            if limit <= 0:
+                break
+        return pd.concat(parts) if parts else _empty_df()
+
+    def load_df(self) -> pd.DataFrame:
+        parts = [self._with_month(m, self._store(m).load_df()) for m in self.months()]
+        parts = [df for df in parts if len(df)]
+        return pd.concat(parts) if parts else _empty_df()
+
+    def iter_chunks(self, start: str | None = None, end: str | None = None, chunksize: int = 10_000):
+        for month in self.months(start, end):
+            yield from self._store(month).iter_chunks(start, end, chunksize)
+
+    def find_phone(self, phone, since: str | None = None) -> list:
+        return [(f"{m}/{i}", day) for m in self.months(since) for i, day in self._store(m).find_phone(phone, since)]
+
+    def search(self, query: str, limit: int = 50) -> pd.DataFrame:
+        parts = []
+        for month in reversed(self.months()):
+            df = self._store(month).search(query, limit)
+            if len(df):
+                parts.append(self._with_month(month, df))
+                limit -= len(df)
+                if limit <= 0:
+                    break
+        return pd.concat(parts) if parts else _empty_df()
+
+    def delete(self, ids) -> int:
+        by_month = {}
+        for i in ids:
+            month, _, local = str(i).partition("/")
+            by_month.setdefault(month, []).append(local)
+        months = set(self.months())
+        return sum(self._store(m).delete(local) for m, local in by_month.items() if m in months)
+
+    def _drop(self, month: str) -> int:
+        """한 달 파일(과 WAL·묘비 등 딸린 파일)을 지운다. 지운 행 수를 돌려준다."""
+        store = self._store(month)
+        n = store.count()
+        with self._lock:
+            self._stores.pop(month, None)
+            for path in self.root.glob(f"{month}{self.suffix}*"):
+                path.unlink(missing_ok=True)
+        if isinstance(store, CsvContactStore):
+            store._invalidate()
+        return n
+
+    def purge(self, before: str) -> int:
+        """before 가 속한 달보다 앞선 달은 파일째 지우고, 그 달(1일이 아닐 때)만 행 단위로 지운다."""
+        n = sum(self._drop(m) for m in self.months() if m < before[:7])
+        if before[8:] != "01" and before[:7] in self.months():
+            n += self._store(before[:7]).purge(before)
+        return n
+
+    def wipe(self):
+        for month in self.months():
+            self._drop(month)
+
+
+# ========= 이전(migration) =========
+# 옮긴 뒤 원본 CSV 와 묘비 파일은 지운다. 백업을 남기면 보관 기간(purge)·삭제 요청과 상관없이
+# 이름·연락처가 평문으로 계속 남기 때문이다. 백업이 필요하면 이전 전에 직접 떠 두고 같은 주기로 파기한다.
+def _csv_files(csv_path) -> list:
+    """CSV 저장소가 쓰는 파일들 + 예전 버전이 이전 후 남긴 *.migrated 사본."""
+    csv_path = Path(csv_path)
+    files = [csv_path, csv_path.with_name(csv_path.name + ".deleted")]
+    return files + [p.with_name(p.name + ".migrated") for p in files]
+
+
+def remove_migrated(csv_path) -> int:
+    """예전 버전이 남긴 contacts.csv(.deleted).migrated 사본을 지운다. 지운 파일 수를 돌려준다."""
+    n = 0
+    for path in _csv_files(csv_path)[2:]:
+        if path.exists():
+            path.unlink()
+            n += 1
+    return n
+
+
+def _remove_csv(source: CsvContactStore):
+    for path in _csv_files(source.path):
+        path.unlink(missing_ok=True)
+    source._invalidate()
+
+
+def migrate_csv_to_sqlite(csv_path, db_path) -> int:
+    """contacts.csv 의 모든 행을 SQLite 로 옮기고(커밋 후) 원본 CSV·묘비 파일은 지운다. 옮긴 행 수를 돌려준다."""
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        return 0
+    source = CsvContactStore(csv_path)
+    df = source.load_df().reindex(columns=COLUMNS).fillna("")
+    store = SqliteContactStore(db_path)
+    store.append_many(df.itertuples(index=False, name=None))
+    _remove_csv(source)
+    return len(df)
+
+
+def migrate_to_partitions(root, backend: str = "sqlite", csv_path=None, db_path=None,
+                          compact_ratio: float = DEFAULT_COMPACT_RATIO) -> int:
+    """
+    단일 contacts.csv / contacts.db 의 행을 신청일 기준 월별 파티션으로 옮긴다. 옮긴 행 수를 돌려준다.
+    다 옮긴 뒤 CSV 원본·묘비 파일은 지우고, SQLite 는 (리드 집계가 같은 파일에 있으므로) contacts 만 비운다.
+    """
+    # 임시 폴더에 다 옮긴 뒤 이름을 바꾸므로, 중간에 멈춰도 다음 실행에서 처음부터 다시 옮긴다.
+    root = Path(root)
+    tmp = root.with_name(root.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    store = PartitionedContactStore(tmp, backend, compact_ratio=compact_ratio)
+    sources = []
+    if csv_path and Path(csv_path).exists():
+        sources.append(CsvContactStore(csv_path))
+    if db_path and Path(db_path).exists():
+        sources.append(SqliteContactStore(db_path))
+    n = 0
+    for source in sources:
+        for chunk in source.iter_chunks(chunksize=50_000):
+            chunk = chunk.reindex(columns=COLUMNS).fillna("")
+            store.append_many(chunk.itertuples(index=False, name=None))
+            n += len(chunk)
+    os.replace(tmp, root)
+    for source in sources:
+        if isinstance(source, CsvContactStore):
+            _remove_csv(source)
+        else:
+            source.wipe()
+    return n
+
+
+def open_store(backend: str, csv_path, db_path, compact_ratio: float = DEFAULT_COMPACT_RATIO,
+               partition_dir=None) -> ContactStore:
+    """
+    backend: "sqlite" | "csv". SQLite 를 처음 열 때 기존 CSV 가 있으면 자동으로 1회 이전한다.
+    partition_dir 를 주면 월별 파티션 저장소를 쓰고, 폴더가 처음 생길 때 기존 단일 CSV/DB 를 이전한다.
+    이전한 원본은 남기지 않는다 (예전 버전이 남긴 *.migrated 사본도 열 때 지운다).
+    """
+    if partition_dir is not None or backend != "csv":
+        remove_migrated(csv_path)
+    if partition_dir is not None:
+        if not Path(partition_dir).exists():
+            migrate_to_partitions(partition_dir, backend, csv_path, db_path, compact_ratio)
+        return PartitionedContactStore(partition_dir, backend, compact_ratio=compact_ratio)
+    if backend == "csv":
+        return CsvContactStore(csv_path, compact_ratio=compact_ratio)
+    if backend == "sqlite":
+        if not Path(db_path).exists():
+            migrate_csv_to_sqlite(csv_path, db_path)
+        return SqliteContactStore(db_path)
+    raise ValueError(f"알 수 없는 저장소: {backend}")
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="상담 신청 저장소 도구")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    m = sub.add_parser("migrate", help="contacts.csv → SQLite 이전")
+    m.add_argument("--csv", default="contacts.csv")
+    m.add_argument("--db", default="contacts.db")
+    c = sub.add_parser("compact", help="CSV 묘비(삭제분) 정리")
+    c.add_argument("--csv", default="contacts.csv")
+    t = sub.add_parser("partition", help="단일 contacts.csv / contacts.db → 월별 파티션 이전")
+    t.add_argument("--dir", default="contacts")
+    t.add_argument("--backend", choices=list(PARTITION_SUFFIX), default="sqlite")
+    t.add_argument("--csv")
+    t.add_argument("--db")
+    g = sub.add_parser("purge", help="보관 기간이 지난 달 파기")
+    g.add_argument("--dir", default="contacts")
+    g.add_argument("--backend", choices=list(PARTITION_SUFFIX), default="sqlite")
+    g.add_argument("--months", type=int, default=12, help="이번 달 포함 보관할 개월 수")
+    args = p.parse_args(argv)
+
+    if args.cmd == "migrate":
+        n = migrate_csv_to_sqlite(args.csv, args.db)
+        print(f"{n:,}건 이전 완료 → {args.db}")
+    elif args.cmd == "compact":
+        n = CsvContactStore(args.csv).compact()
+        print(f"{n:,}건 정리 완료 → {args.csv}")
+    elif args.cmd == "partition":
+        n = migrate_to_partitions(args.dir, args.backend, args.csv, args.db)
+        print(f"{n:,}건 이전 완료 → {args.dir}/")
+    elif args.cmd == "purge":
+        before = retention_cutoff(args.months)
+        n = PartitionedContactStore(args.dir, args.backend).purge(before)
+        print(f"{before} 이전 신청 {n:,}건 파기 → {args.dir}/")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
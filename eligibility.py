@@ -0,0 +1,405 @@
+# eligibility.py
+"""
+정책자금 자격 판정 엔진.
+
+자금 목록·금리·기준값·판정 조건은 policy_catalog.toml 에 두고, 파일을 한 번 읽어
+조건식을 컴파일한 `PolicyCatalog` 로 판정한다. `CatalogCache` 는 파일이 바뀌었을 때만
+다시 컴파일하므로, 실행 중인 앱에도 재배포 없이 새 기준이 반영된다.
+
+- 화면(main.py)에서는 신청인 1명을 `match_funds` / `rejection_reasons` 로 판정하고,
+- 제휴사 리드 목록은 `evaluate_batch` 로 DataFrame 전체를 한 번에(벡터 연산) 판정한다.
+
+두 경로 모두 같은 컴파일된 조건식(`PolicyCatalog.fund_masks`)을 사용하므로 결과가 어긋나지 않는다.
+
+CLI:
+    python eligibility.py leads.csv -o results.csv --chunksize 50000 [--catalog policy_catalog.toml]
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import functools
+import hashlib
+import os
+import sys
+import threading
+import tomllib
+from datetime import date
+from pathlib import Path
+
+from lazy import lazy_module
+
+# 일괄 판정(evaluate_batch)에서만 쓴다. 신청인 1명 판정은 스칼라 연산이라 불러오지 않는다.
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+CATALOG_PATH = Path(os.environ.get("POLICY_CATALOG", Path(__file__).with_name("policy_catalog.toml")))
+
+# ========= 입력 =========
+FLAG_COLUMNS = [
+    "flag_export", "flag_growth10", "flag_smart_factory", "flag_strong_local", "flag_postgrad",
+    "flag_smart_tech", "flag_baeknyeon", "flag_social", "flag_academy",
+    "flag_restartup", "flag_debtrehab", "flag_distress",
+]
+
+# 배치 입력 컬럼 (날짜는 ISO 문자열 또는 datetime)
+INPUT_COLUMNS = ["birth", "biz_start", "sales", "credit_nice", "credit_kcb", "employees", "biz_sector"] + FLAG_COLUMNS
+
+# 조건식에서 쓸 수 있는 입력값 이름 (applicant_values / _batch_values 가 채운다)
+VALUE_NAMES = {"sales", "credit_nice", "credit_kcb", "employees", "employee_cap", "age", "biz_months", *FLAG_COLUMNS}
+
+REASON_BAD_DATE = "날짜 입력 오류"
+REASON_BAD_NUMBER = "입력값 오류"  # 매출·신용점수·직원 수가 비었거나 숫자가 아님
+REASON_SEP = " · "
+
+
+# ========= 유틸 =========
+def years_between(d: date, ref: date | None = None) -> float:
+    if ref is None: ref = date.today()
+    return (ref - d).days / 365.25
+
+def months_between(d: date, ref: date | None = None) -> float:
+    if ref is None: ref = date.today()
+    return (ref.year - d.year) * 12 + (ref.month - d.month) + (ref.day - d.day) / 30
+
+
+# ========= 조건식 컴파일 =========
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub,
+    ast.Compare, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq, ast.Name, ast.Load, ast.Constant,
+)
+
+class _Vectorize(ast.NodeTransformer):
+    """
+    and/or/not → &/|/^True, 연쇄 비교 → 비교의 &, 기준값 이름 → 상수.
+    결과 식은 `&`, `|`, `^`, 비교만 쓰므로 스칼라와 numpy 배열 모두에 그대로 동작한다.
+    """
+    def __init__(self, consts: dict):
+        self.consts = consts
+
+    @staticmethod
+    def _join(op, nodes):
+        return functools.reduce(lambda a, b: ast.BinOp(a, op, b), nodes)
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        return self._join(ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr(), node.values)
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.BinOp(node.operand, ast.BitXor(), ast.Constant(True))
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        terms = [node.left, *node.comparators]
+        return self._join(ast.BitAnd(), [ast.Compare(a, [op], [b]) for a, op, b in zip(terms, node.ops, terms[1:])])
+
+    def visit_Name(self, node):
+        if node.id in self.consts:
+            return ast.Constant(self.consts[node.id])
+        if node.id not in VALUE_NAMES:
+            raise ValueError(f"알 수 없는 이름: {node.id}")
+        return node
+
+def _is_bool(node) -> bool:
+    """참/거짓 자리에 올 수 있는 식: 비교, and/or/not, flag_* 이름."""
+    if isinstance(node, (ast.Compare, ast.BoolOp)):
+        return True
+    if isinstance(node, ast.UnaryOp):
+        return isinstance(node.op, ast.Not)
+    return isinstance(node, ast.Name) and node.id in FLAG_COLUMNS
+
+def _bool_operands(node):
+    if isinstance(node, ast.Expression):
+        return [node.body]
+    if isinstance(node, ast.BoolOp):
+        return node.values
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return [node.operand]
+    return []
+
+def compile_rule(expr: str, consts: dict, label: str = "rule"):
+    """
+    카탈로그 조건식 문자열 → eval 용 code 객체.
+    and/or/not 은 비트 연산(&, |, ^)으로 바뀌므로 피연산자(와 식 전체)는 참/거짓 식이어야 한다.
+    """
+    try:
+        tree = ast.parse(" ".join(expr.split()), mode="eval")
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise ValueError(f"허용되지 않는 문법: {type(node).__name__}")
+            if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+                raise ValueError(f"숫자가 아닌 상수: {node.value!r}")
+            for operand in _bool_operands(node):
+                if not _is_bool(operand):
+                    raise ValueError(f"참/거짓이 아닌 식: {ast.unparse(operand)} (비교 또는 flag_* 를 쓰세요)")
+        tree = ast.fix_missing_locations(_Vectorize(consts).visit(tree))
+        return compile(tree, f"<catalog:{label}>", "eval")
+    except (SyntaxError, ValueError) as e:
+        raise ValueError(f"{label} 조건식 오류: {e}") from e
+
+def _run(code, v: dict):
+    return eval(code, {"__builtins__": {}}, v)
+
+
+# ========= 카탈로그 =========
+class _Amount(int):
+    """사유 문구용 기준값: "{min_sales:만원}" → "1,000만원" (그 밖의 서식은 int 와 같다)."""
+
+    def __format__(self, spec):
+        if spec == "만원":
+            return f"{self / 10_000:,.0f}만원"
+        return format(int(self), spec)
+
+class PolicyCatalog:
+    """policy_catalog.toml 을 컴파일한 판정 기준. `version` 은 "파일 version@내용 해시 8자리"."""
+
+    def __init__(self, data: dict, digest: str):
+        self.digest = digest
+        self.version = f"{data['version']}@{digest[:8]}"
+        self.base_rate = float(data["base_rate"])
+        self.thresholds = dict(data.get("thresholds", {}))
+        clash = VALUE_NAMES & set(self.thresholds)
+        if clash:
+            raise ValueError(f"기준값 이름이 입력값과 겹칩니다: {sorted(clash)}")
+        caps = data.get("employee_cap", {})
+        self.default_cap = int(caps.get("default", 5))
+        self.sector_caps = {k: int(n) for k, n in caps.get("sectors", {}).items()}
+
+        consts = self.thresholds
+        self._gate = compile_rule(data["gate"]["when"], consts, "gate")
+        # 사유 문구의 {이름} 은 기준값과 업종별 직원 수 상한 안내로 채운다 (카탈로그를 고치면 문구도 따라 바뀜).
+        words = {k: _Amount(n) if isinstance(n, int) else n for k, n in consts.items()}
+        words["employee_caps"] = self.employee_cap_text()
+        self.reasons = [
+            (r["text"].format(**words), compile_rule(r["when"], consts, f"reasons[{i}]"))
+            for i, r in enumerate(data.get("reasons", []))
+        ]
+        self.funds, self._rules = [], []
+        for f in data["funds"]:
+            self.funds.append({
+                "id": f["id"], "name": f["name"], "range": f["range"], "rate": self.rate_text(f["rates"]),
+                "notes": f.get("notes", ""), "link": f.get("link", ""), "catalog_version": self.version,
+            })
+            self._rules.append((f["id"], compile_rule(f["when"], consts, f["id"])))
+
+    def rate_text(self, rates: list) -> str:
+        """[{label?, spread}] → "연 3.28% (기준 2.68% +0.6%p)" (여러 개면 " / " 로 연결)."""
+        parts = []
+        for r in rates:
+            spread = float(r["spread"])
+            text = f"연 {self.base_rate + spread:.2f}% (기준 {self.base_rate:.2f}% +{spread:.1f}%p)"
+            parts.append(f"{r['label']} {text}" if r.get("label") else text)
+        return " / ".join(parts)
+
+    def employee_cap_text(self) -> str:
+        """"제조업, 건설업 10인 / 그 외 5인" (상한이 큰 업종 묶음부터)."""
+        groups = {}
+        for sector, cap in self.sector_caps.items():
+            groups.setdefault(cap, []).append(sector)
+        parts = [f"{', '.join(sectors)} {cap}인" for cap, sectors in sorted(groups.items(), reverse=True)]
+        return " / ".join(parts + [f"{'그 외 ' if parts else ''}{self.default_cap}인"])
+
+    def employee_cap(self, sector: str) -> int:
+        return self.sector_caps.get(sector, self.default_cap)
+
+    def employee_cap_ok(self, sector: str, emp: int) -> bool:
+        return emp < self.employee_cap(sector)
+
+    def fund_masks(self, v: dict) -> tuple:
+        """
+        v 의 값은 스칼라(파이썬 값) 또는 같은 길이의 numpy 배열.
+        반환: (최소 게이트, {자금 id: 해당 여부})
+        """
+        gate = _run(self._gate, v)
+        return gate, {fid: gate & _run(code, v) for fid, code in self._rules}
+
+    def reason_masks(self, v: dict) -> list:
+        """탈락 사유별 (문구, 해당 여부). 스칼라/배열 공용."""
+        return [(msg, _run(code, v)) for msg, code in self.reasons]
+
+def load_catalog(raw: bytes) -> PolicyCatalog:
+    return PolicyCatalog(tomllib.loads(raw.decode("utf-8")), hashlib.sha256(raw).hexdigest())
+
+class CatalogCache:
+    """
+    카탈로그 파일의 mtime/크기가 바뀌었을 때만 내용 해시를 비교해 다시 컴파일한다.
+    새 파일에 오류가 있으면 이전 카탈로그를 계속 쓰고 `error` 에 사유를 남긴다.
+    """
+
+    def __init__(self, path=CATALOG_PATH):
+        self.path = Path(path)
+        self.error = None
+        self._stat = None
+        self._catalog = None
+        self._lock = threading.Lock()
+
+    def get(self) -> PolicyCatalog:
+        try:
+            st = self.path.stat()
+            key = (st.st_mtime_ns, st.st_size)
+        except OSError as e:
+            if self._catalog is None:
+                raise
+            self.error = str(e)
+            return self._catalog
+        if key == self._stat:
+            return self._catalog
+        with self._lock:
+            if key != self._stat:
+                raw = self.path.read_bytes()
+                if self._catalog is None or hashlib.sha256(raw).hexdigest() != self._catalog.digest:
+                    try:
+                        self._catalog, self.error = load_catalog(raw), None
+                    except (tomllib.TOMLDecodeError, KeyError, TypeError, ValueError) as e:
+                        if self._catalog is None:
+                            raise
+                        self.error = f"{type(e).__name__}: {e}"
+                self._stat = key
+            return self._catalog
+
+_DEFAULT_CACHE = CatalogCache()
+
+def current_catalog() -> PolicyCatalog:
+    """CATALOG_PATH 카탈로그 (프로세스 공용)."""
+    return _DEFAULT_CACHE.get()
+
+
+# ========= 단건 판정 (화면용) =========
+def applicant_values(app: dict, ref: date | None = None, catalog: PolicyCatalog | None = None) -> dict:
+    """신청인 dict → 규칙 입력값(스칼라). 나이·업력은 ref(기본: 오늘) 기준으로 계산한다."""
+    if catalog is None: catalog = current_catalog()
+    v = {f: bool(app.get(f, False)) for f in FLAG_COLUMNS}
+    v.update(
+        sales=app["sales"],
+        credit_nice=app["credit_nice"],
+        credit_kcb=app["credit_kcb"],
+        employees=app["employees"],
+        employee_cap=catalog.employee_cap(app["biz_sector"]),
+        age=int(years_between(app["birth"], ref)),
+        biz_months=months_between(app["biz_start"], ref),
+    )
+    return v
+
+def match_funds(app: dict, ref: date | None = None, catalog: PolicyCatalog | None = None) -> list:
+    """
+    신청인 1명(dict: INPUT_COLUMNS 키)에 해당하는 자금 목록(catalog.funds 항목)을 돌려준다.
+    각 항목의 "catalog_version" 에 판정에 쓴 카탈로그 버전이 들어 있다.
+    """
+    if catalog is None: catalog = current_catalog()
+    _, funds = catalog.fund_masks(applicant_values(app, ref, catalog))
+    return [f for f in catalog.funds if funds[f["id"]]]
+
+def rejection_reasons(app: dict, ref: date | None = None, catalog: PolicyCatalog | None = None) -> list:
+    """해당 자금이 없을 때 안내할 탈락 사유 문구 목록."""
+    if catalog is None: catalog = current_catalog()
+    return [msg for msg, hit in catalog.reason_masks(applicant_values(app, ref, catalog)) if hit]
+
+
+# ========= 배치 판정 (벡터 연산) =========
+_TRUE_VALUES = [True, 1, "True", "true", "TRUE", "1", "Y", "y", "yes", "Yes"]
+
+def _flag_array(s: pd.Series) -> np.ndarray:
+    if pd.api.types.is_bool_dtype(s):
+        return s.to_numpy(dtype=bool)
+    return s.isin(_TRUE_VALUES).to_numpy()
+
+def _batch_values(df: pd.DataFrame, ref: date, catalog: PolicyCatalog) -> tuple:
+    ref_ts = pd.Timestamp(ref)
+    birth = pd.to_datetime(df["birth"], errors="coerce")
+    start = pd.to_datetime(df["biz_start"], errors="coerce")
+
+    def num(col):
+        return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+
+    v = {f: _flag_array(df[f]) if f in df.columns else np.zeros(len(df), dtype=bool) for f in FLAG_COLUMNS}
+    v.update(
+        sales=num("sales"),
+        credit_nice=num("credit_nice"),
+        credit_kcb=num("credit_kcb"),
+        employees=num("employees"),
+        employee_cap=df["biz_sector"].map(catalog.sector_caps).fillna(catalog.default_cap).to_numpy(dtype=np.int64),
+        age=np.trunc((ref_ts - birth).dt.days.to_numpy(dtype=float) / 365.25),
+        biz_months=(
+            (ref.year - start.dt.year) * 12
+            + (ref.month - start.dt.month)
+            + (ref.day - start.dt.day) / 30
+        ).to_numpy(dtype=float),
+    )
+    bad_input = {
+        REASON_BAD_DATE: (birth.isna() | start.isna()).to_numpy(),
+        REASON_BAD_NUMBER: np.isnan(v["sales"]) | np.isnan(v["credit_nice"]) | np.isnan(v["credit_kcb"])
+                           | np.isnan(v["employees"]),
+    }
+    return v, bad_input
+
+def evaluate_batch(df: pd.DataFrame, ref: date | None = None, catalog: PolicyCatalog | None = None) -> pd.DataFrame:
+    """
+    신청인 DataFrame(INPUT_COLUMNS; flag_* 컬럼은 없으면 False)을 한 번에 판정한다.
+    반환 컬럼: gate, 자금명별 bool, matched(해당 자금 수), reasons(해당 자금이 없을 때 사유), catalog_version
+    """
+    if ref is None: ref = date.today()
+    if catalog is None: catalog = current_catalog()
+    v, bad_input = _batch_values(df, ref, catalog)
+    gate, funds = catalog.fund_masks(v)
+    # 날짜·숫자를 읽지 못한 행은 값이 NaN 이라 조건식만으로는 걸러지지 않으므로 여기서 모두 탈락시킨다
+    bad = np.logical_or.reduce(list(bad_input.values()))
+    gate = gate & ~bad
+    funds = {fid: hit & ~bad for fid, hit in funds.items()}
+
+    out = pd.DataFrame(index=df.index)
+    out["gate"] = gate
+    matched = np.zeros(len(df), dtype=np.int64)
+    for f in catalog.funds:
+        out[f["name"]] = funds[f["id"]]
+        matched += funds[f["id"]]
+    out["matched"] = matched
+
+    reasons = np.full(len(df), "", dtype=object)
+    for msg, hit in [*bad_input.items(), *catalog.reason_masks(v)]:
+        reasons = reasons + np.where(hit, msg + REASON_SEP, "").astype(object)
+    reasons = pd.Series(reasons, index=df.index, dtype=object).str.removesuffix(REASON_SEP)
+    out["reasons"] = reasons.where(matched == 0, "")
+    out["catalog_version"] = catalog.version
+    return out
+
+
+# ========= CLI: CSV 스트리밍 판정 =========
+def screen_csv(src, dst, chunksize: int = 50_000, ref: date | None = None, catalog: PolicyCatalog | None = None) -> int:
+    """
+    src CSV 를 chunksize 행씩 읽어 판정 결과 컬럼을 붙여 dst(텍스트 파일 객체)로 쓴다. 처리 행 수를 돌려준다.
+    도중에 카탈로그 파일이 바뀌어도 모든 chunk 를 시작 시점의 카탈로그로 판정한다.
+    """
+    if ref is None: ref = date.today()
+    if catalog is None: catalog = current_catalog()
+    total = 0
+    for i, chunk in enumerate(pd.read_csv(src, chunksize=chunksize, dtype={"biz_sector": str})):
+        res = evaluate_batch(chunk, ref, catalog)
+        pd.concat([chunk, res], axis=1).to_csv(dst, header=(i == 0), index=False)
+        total += len(chunk)
+    return total
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="리드 CSV 일괄 정책자금 판정")
+    p.add_argument("src", help="입력 CSV (컬럼: " + ", ".join(INPUT_COLUMNS[:7]) + ", flag_* 선택)")
+    p.add_argument("-o", "--output", default="-", help="출력 CSV (기본: 표준출력)")
+    p.add_argument("--chunksize", type=int, default=50_000)
+    p.add_argument("--ref-date", type=date.fromisoformat, default=None, help="판정 기준일 (YYYY-MM-DD, 기본: 오늘)")
+    p.add_argument("--catalog", type=Path, default=CATALOG_PATH, help=f"정책 카탈로그 (기본: {CATALOG_PATH.name})")
+    args = p.parse_args(argv)
+
+    catalog = load_catalog(args.catalog.read_bytes())
+    if args.output == "-":
+        n = screen_csv(args.src, sys.stdout, chunksize=args.chunksize, ref=args.ref_date, catalog=catalog)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8-sig") as dst:
+            n = screen_csv(args.src, dst, chunksize=args.chunksize, ref=args.ref_date, catalog=catalog)
+    print(f"{n:,}건 판정 완료 (카탈로그 {catalog.version})", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# export.py
+"""
+관리자 다운로드용 내보내기.
+
+저장소에서 chunk 단위로 읽어 바로 인코딩/압축하므로, 전체 내역을 DataFrame 과
+CSV 문자열로 두 번 들고 있지 않는다. st.download_button(data=callable) 에 넘겨
+사용자가 실제로 버튼을 눌렀을 때만 만들어지도록 한다.
+Parquet 은 pyarrow 가 있을 때만 형식 목록에 나온다 (requirements.txt 에 명시, streamlit 도 함께 설치한다).
+"""
+import codecs
+import gzip
+import importlib.util
+import io
+from datetime import date, timedelta
+
+from contact_store import COLUMNS
+
+# 형식 이름 → (파일 확장자, MIME)
+FORMATS = {
+    "CSV (엑셀용, UTF-8 BOM)": ("csv", "text/csv"),
+    "CSV 압축 (.csv.gz)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+PERIODS = {"전체": None, "최근 7일": 7, "최근 30일": 30, "최근 90일": 90}
+
+
+def available_formats() -> list:
+    fmts = list(FORMATS)
+    if importlib.util.find_spec("pyarrow") is None:
+        fmts.remove("Parquet")
+    return fmts
+
+
+def period_range(days: int | None, today: date | None = None):
+    """최근 days 일(오늘 포함) → (start, end) ISO 문자열. None 이면 전체."""
+    if days is None:
+        return None, None
+    if today is None: today = date.today()
+    return (today - timedelta(days=days - 1)).isoformat(), today.isoformat()
+
+
+def iter_csv_bytes(store, start=None, end=None, chunksize: int = 10_000):
+    """UTF-8 BOM CSV 를 chunk 단위 bytes 로 내보낸다 (헤더는 첫 chunk 에만)."""
+    yield codecs.BOM_UTF8
+    header = True
+    for chunk in store.iter_chunks(start, end, chunksize):
+        yield chunk.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+    if header:
+        yield (",".join(COLUMNS) + "\n").encode("utf-8")
+
+
+def export_bytes(store, fmt: str, start=None, end=None, chunksize: int = 10_000) -> bytes:
+    """fmt(FORMATS 키) 형식으로 [start, end] 기간 내역을 만든다."""
+    ext, _ = FORMATS[fmt]
+    if ext == "csv":
+        return b"".join(iter_csv_bytes(store, start, end, chunksize))
+    if ext == "csv.gz":
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=6) as gz:
+            for part in iter_csv_bytes(store, start, end, chunksize):
+                gz.write(part)
+        return buf.getvalue()
+    if ext == "parquet":
+        return _parquet_bytes(store, start, end, chunksize)
+    raise ValueError(f"알 수 없는 형식: {fmt}")
+
+
+def _parquet_bytes(store, start, end, chunksize) -> bytes:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(c, pa.string()) for c in COLUMNS])
+    buf = io.BytesIO()
+    with pq.ParquetWriter(buf, schema, compression="zstd") as writer:
+        for chunk in store.iter_chunks(start, end, chunksize):
+            writer.write_table(pa.Table.from_pandas(chunk.astype(str), schema=schema, preserve_index=False))
+    return buf.getvalue()
+
+
+def file_name(fmt: str, start=None, end=None) -> str:
+    ext, _ = FORMATS[fmt]
+    suffix = f"_{start}_{end}" if start or end else ""
+    return f"contacts{suffix}.{ext}"
@@ -0,0 +1,33 @@
+# lazy.py
+"""
+무거운 모듈 지연 import.
+
+    pd = lazy_module("pandas")   # 이 줄에서는 import 하지 않는다
+    pd.DataFrame(...)            # 첫 속성 접근 때 실제로 import (이후는 그대로 사용)
+
+공개 화면(진단·상담 신청)은 pandas/numpy 없이 돌고, 관리자 화면·일괄 판정처럼 실제로 쓰는 곳에서
+처음 필요할 때 한 번만 불러온다. 함수 주석(-> pd.DataFrame)이 정의 시점에 평가되지 않도록
+쓰는 모듈에 `from __future__ import annotations` 를 함께 둔다.
+"""
+import importlib
+import sys
+
+
+class _LazyModule:
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self._name in sys.modules else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_module(name: str):
+    return _LazyModule(name)
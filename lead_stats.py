@@ -0,0 +1,171 @@
+# lead_stats.py
+"""
+리드 분석용 누적 집계.
+
+진단 제출·상담 신청이 일어날 때마다 (일자, 지표) 카운트를 UPSERT 로 1씩 올린다 (이벤트당 O(1)).
+관리자 화면은 최근 N일 행과 누적(day="") 행만 읽으므로, 내역이 아무리 쌓여도 같은 시간에 그린다.
+
+지표:
+    diagnosis                진단 제출
+    no_match                 해당 자금 없음
+    fund:<자금 id>           자금별 해당
+    contact                  상담 신청
+    contact_after_diagnosis  같은 세션에서 진단 후 상담 신청 (전환 퍼널)
+
+원본 이벤트(lead_events)도 한 줄씩 남기므로, 집계가 어긋나면 rebuild 로 처음부터 다시 만든다.
+SQLite 저장소를 쓰면 contacts.db 안에, CSV 저장소를 쓰면 옆의 별도 파일에 둔다.
+
+CLI:
+    python lead_stats.py rebuild --db contacts.db --contacts-db contacts.db
+    python lead_stats.py rebuild --db contacts.stats.db --csv contacts.csv
+    python lead_stats.py rebuild --db contacts.db --partitions contacts
+"""
+import argparse
+import sys
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlite_tx import transaction
+
+TOTAL = ""  # 누적 행의 day 값
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lead_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    metrics TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lead_stats (
+    day TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, metric)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = (
+    "INSERT INTO lead_stats(day, metric, count) VALUES (?, ?, 1) "
+    "ON CONFLICT(day, metric) DO UPDATE SET count = count + 1"
+)
+
+
+class LeadStats:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._tx() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_SCHEMA)
+
+    def _tx(self):
+        return transaction(self.path)
+
+    # ========= 기록 =========
+    def record(self, metrics: list, day: str | None = None):
+        """이벤트 1건: 원본을 남기고 일자별·누적 카운트를 올린다."""
+        if day is None: day = date.today().isoformat()
+        with self._tx() as con:
+            con.execute("INSERT INTO lead_events(day, metrics) VALUES (?, ?)", (day, " ".join(metrics)))
+            con.executemany(_UPSERT, [(d, m) for m in metrics for d in (day, TOTAL)])
+
+    def record_diagnosis(self, fund_ids: list, day: str | None = None):
+        self.record(["diagnosis"] + ([f"fund:{f}" for f in fund_ids] or ["no_match"]), day)
+
+    def record_contact(self, after_diagnosis: bool, day: str | None = None):
+        self.record(["contact"] + (["contact_after_diagnosis"] if after_diagnosis else []), day)
+
+    # ========= 조회 (기록 건수와 무관하게 읽는 행 수가 일정) =========
+    def totals(self) -> dict:
+        with self._tx() as con:
+            return dict(con.execute("SELECT metric, count FROM lead_stats WHERE day = ?", (TOTAL,)))
+
+    def daily(self, days: int, today: date | None = None) -> dict:
+        """최근 days 일 {일자: {지표: 건수}} (오늘 포함)."""
+        if today is None: today = date.today()
+        start = (today - timedelta(days=days - 1)).isoformat()
+        out = {}
+        with self._tx() as con:
+            for day, metric, n in con.execute(
+                "SELECT day, metric, count FROM lead_stats WHERE day >= ? AND day <= ?", (start, today.isoformat()),
+            ):
+                out.setdefault(day, {})[metric] = n
+        return out
+
+    def daily_series(self, metrics: dict, days: int = 30, today: date | None = None) -> dict:
+        """차트용 열 dict. metrics: {지표: 열 이름}. 기록이 없는 날은 0."""
+        if today is None: today = date.today()
+        rows = self.daily(days, today)
+        series = {"일자": [(today - timedelta(days=i)).isoformat() for i in range(days - 1, -1, -1)]}
+        for metric, label in metrics.items():
+            series[label] = [rows.get(d, {}).get(metric, 0) for d in series["일자"]]
+        return series
+
+    def weekly_series(self, metrics: dict, weeks: int = 12, today: date | None = None) -> dict:
+        """최근 weeks 주(월요일 시작) 합계."""
+        if today is None: today = date.today()
+        monday = today - timedelta(days=today.weekday())
+        starts = [monday - timedelta(weeks=i) for i in range(weeks - 1, -1, -1)]
+        rows = self.daily((today - starts[0]).days + 1, today)
+        series = {"주": [s.isoformat() for s in starts]}
+        for metric, label in metrics.items():
+            series[label] = [
+                sum(rows.get((s + timedelta(days=k)).isoformat(), {}).get(metric, 0) for k in range(7)) for s in starts
+            ]
+        return series
+
+    # ========= 복구 =========
+    def rebuild(self, store=None) -> int:
+        """
+        lead_events 로 집계를 처음부터 다시 만든다. 처리한 이벤트 수를 돌려준다.
+        store(ContactStore)를 주면 이벤트 기록이 시작되기 전 날짜의 상담 신청 건수를 신청일 기준으로 채운다.
+        """
+        counts, events, first = Counter(), 0, None
+        with self._tx() as con:
+            for day, metrics in con.execute("SELECT day, metrics FROM lead_events"):
+                events += 1
+                first = day if first is None else min(first, day)
+                for m in metrics.split():
+                    counts[day, m] += 1
+                    counts[TOTAL, m] += 1
+        if store is not None:
+            end = (date.fromisoformat(first) - timedelta(days=1)).isoformat() if first else None
+            for chunk in store.iter_chunks(None, end):
+                for day, n in chunk["신청일"].value_counts().items():
+                    counts[day, "contact"] += int(n)
+                    counts[TOTAL, "contact"] += int(n)
+        with self._tx() as con:
+            con.execute("DELETE FROM lead_stats")
+            con.executemany("INSERT INTO lead_stats(day, metric, count) VALUES (?, ?, ?)",
+                            [(d, m, n) for (d, m), n in counts.items()])
+        return events
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="리드 분석 집계 도구")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("rebuild", help="원본 이벤트(+상담 신청 내역)로 집계 재생성")
+    r.add_argument("--db", default="contacts.db", help="집계가 들어 있는 SQLite 파일")
+    src = r.add_mutually_exclusive_group()
+    src.add_argument("--contacts-db", help="이벤트 기록 이전 상담 신청을 채울 SQLite 저장소")
+    src.add_argument("--csv", help="이벤트 기록 이전 상담 신청을 채울 CSV 저장소")
+    src.add_argument("--partitions", help="이벤트 기록 이전 상담 신청을 채울 월별 파티션 폴더")
+    r.add_argument("--backend", choices=["sqlite", "csv"], default="sqlite", help="월별 파티션의 하위 저장소")
+    args = p.parse_args(argv)
+
+    from contact_store import CsvContactStore, PartitionedContactStore, SqliteContactStore
+
+    store = None
+    if args.contacts_db:
+        store = SqliteContactStore(args.contacts_db)
+    elif args.csv:
+        store = CsvContactStore(args.csv)
+    elif args.partitions:
+        store = PartitionedContactStore(args.partitions, args.backend)
+    n = LeadStats(args.db).rebuild(store)
+    print(f"이벤트 {n:,}건으로 집계 재생성 완료 → {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,23 @@
 # main.py
 import streamlit as st
-from datetime import date
-import csv
-import pandas as pd
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from datetime import date, timedelta
+import importlib
+import os
+import threading
+import time
 from pathlib import Path
 
+import metrics
+from contact_store import normalize_phone, open_store, phone_key, retention_cutoff
+from lead_stats import LeadStats
+from notify import NotificationQueue, NotificationWorker, SmtpSender, WebhookSender
+from eligibility import INPUT_COLUMNS, CatalogCache, match_funds, rejection_reasons
+from render import PayloadMeter, header_markdown, results_html, sidebar_markdown
+from result_cache import DailyLRU
+from export import FORMATS, PERIODS, available_formats, export_bytes, file_name, period_range
+
 # ========= 기본 설정 =========
 st.set_page_config(
     page_title="광명파트너스 | 정책자금 맞춤 도우미",
@@ -18,357 +31,387 @@ CONTACT_PHONE = "1877-2312"
 KAKAO_LINK = "https://open.kakao.com/o/shxgLPsh"
 ADMIN_PIN = "070913"
 
-# ========= 스타일 =========
-st.markdown("""
-<style>
-.block-container {padding-top: 1.25rem; padding-bottom: 2rem;}
-.card { border: 1px solid #e6e6e6; border-radius: 12px; padding: 16px 18px; margin-bottom: 14px; background: #fff; }
-.result-card{ border:1px solid #E5EAF2; border-radius:14px; padding:14px 16px; margin:10px 0; background:#F9FBFF; }
-.badge {display:inline-block; padding:2px 8px; border-radius:999px; font-size:12px; font-weight:600; margin-left:6px;
-  background:#EEF2FF; color:#334155; border:1px solid #E5E7EB;}
-.small {font-size: 13px; color:#6b7280;}
-hr.soft {border:none; border-top:1px dashed #e5e7eb; margin:10px 0;}
-.sidebar-links a {display:block; margin:6px 0;}
-</style>
-""", unsafe_allow_html=True)
+# ========= 전송량 측정 =========
+def payload_meter() -> PayloadMeter:
+    """세션별 전송량 계측기 (관리자 영역에 표시)."""
+    return st.session_state.setdefault("payload_meter", PayloadMeter())
+
+payload_meter().start("전체", get_script_run_ctx())
+RUN_STARTED = time.perf_counter()
+
+# 관리자 영역에서 켠 세션만 전체 실행을 cProfile 로 잰다 (다음 전체 실행부터).
+profiler = st.session_state.setdefault("profiler", metrics.SessionProfiler())
+if st.session_state.get("profile_on"):
+    profiler.start()
 
 # ========= 경로/파일 =========
 APP_DIR = Path(__file__).parent if "__file__" in globals() else Path(".")
-CONTACTS_CSV = APP_DIR / "contacts.csv"
-
-def append_contact_csv(name, phone, memo):
-    CONTACTS_CSV.parent.mkdir(parents=True, exist_ok=True)
-    file_exists = CONTACTS_CSV.exists()
-    with CONTACTS_CSV.open("a", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        if not file_exists:
-            w.writerow(["이름", "연락처", "메모", "신청일"])
-        w.writerow([name, phone, memo, date.today().isoformat()])
-
-def load_contacts_df():
-    if CONTACTS_CSV.exists():
-        try:
-            return pd.read_csv(CONTACTS_CSV, encoding="utf-8")
-        except Exception:
-            return pd.read_csv(CONTACTS_CSV, encoding="cp949")
-    return pd.DataFrame(columns=["이름", "연락처", "메모", "신청일"])
-
-# ========= 사이드바 =========
+DATA_DIR = Path(os.environ.get("APP_DATA_DIR", APP_DIR))  # 벤치마크 등에서 저장 위치를 바꿀 때
+CONTACTS_CSV = DATA_DIR / "contacts.csv"
+CONTACTS_DB = DATA_DIR / "contacts.db"
+POLICY_CATALOG = Path(os.environ.get("POLICY_CATALOG", APP_DIR / "policy_catalog.toml"))  # 자금·금리·기준값
+CONTACT_BACKEND = os.environ.get("CONTACT_BACKEND", "sqlite")  # "sqlite" | "csv"
+CONTACT_COMPACT_RATIO = 0.2  # CSV: 삭제 묘비가 전체의 20%를 넘으면 파일을 다시 쓴다
+# 월별 파티션(contacts/2026-10.db …). "none" 이면 예전처럼 단일 파일.
+CONTACTS_PARTITION_DIR = DATA_DIR / "contacts" if os.environ.get("CONTACT_PARTITION", "month") == "month" else None
+CONTACT_RETENTION_MONTHS = 12  # 동의 문구 "상담 종료 후 1년 이내 파기": 이번 달 포함 12개 달만 보관
+# 리드 분석 집계: SQLite 저장소면 같은 파일, CSV 저장소면 옆의 별도 파일
+LEAD_STATS_DB = CONTACTS_DB if CONTACT_BACKEND == "sqlite" else CONTACTS_CSV.with_name("contacts.stats.db")
+CONTACT_DUP_DAYS = 30  # 같은 연락처로 이 기간 안에 다시 신청하면 새로 저장하지 않는다
+ADMIN_PAGE_SIZE = 50
+RESULT_CACHE_SIZE = 1024  # 진단 결과 공유 캐시 항목 수 (자정에 비워짐)
+METRICS_FORMAT = os.environ.get("METRICS_FORMAT", "prom")  # "prom" | "jsonl" | "off"
+METRICS_FILE = DATA_DIR / f"metrics.{METRICS_FORMAT}"
+METRICS_INTERVAL = 60  # 초
+# 새 상담 신청 알림: 웹훅(메신저) URL 이 있으면 웹훅, 없고 SMTP 서버가 있으면 이메일, 둘 다 없으면 끔
+NOTIFY_DB = DATA_DIR / "notify.db"
+NOTIFY_WEBHOOK_URL = os.environ.get("NOTIFY_WEBHOOK_URL", "")
+NOTIFY_SMTP_HOST = os.environ.get("NOTIFY_SMTP_HOST", "")
+NOTIFY_SMTP_PORT = int(os.environ.get("NOTIFY_SMTP_PORT", "587"))
+NOTIFY_SMTP_FROM = os.environ.get("NOTIFY_SMTP_FROM", "")
+NOTIFY_SMTP_TO = [a.strip() for a in os.environ.get("NOTIFY_SMTP_TO", "").split(",") if a.strip()]
+NOTIFY_SMTP_USER = os.environ.get("NOTIFY_SMTP_USER", "")
+NOTIFY_SMTP_PASSWORD = os.environ.get("NOTIFY_SMTP_PASSWORD", "")
+
+@st.cache_resource
+def get_contact_store():
+    # 프로세스당 1회 생성해 모든 세션이 공유한다 (첫 실행 시 기존 단일 CSV/DB 자동 이전).
+    return open_store(CONTACT_BACKEND, CONTACTS_CSV, CONTACTS_DB, compact_ratio=CONTACT_COMPACT_RATIO,
+                      partition_dir=CONTACTS_PARTITION_DIR)
+
+@st.cache_resource
+def get_lead_stats():
+    get_contact_store()  # SQLite 자동 이전이 먼저 끝나도록
+    return LeadStats(LEAD_STATS_DB)
+
+@st.cache_resource
+def get_catalog_cache():
+    # 모든 세션이 공유하고, 카탈로그 파일이 바뀐 경우에만 다시 컴파일한다 (재배포 불필요).
+    return CatalogCache(POLICY_CATALOG)
+
+@st.cache_resource
+def get_result_cache():
+    # 모든 세션이 공유한다. 같은 날 같은 입력이면 판정·What-if·결과 HTML 을 다시 만들지 않는다.
+    return DailyLRU(RESULT_CACHE_SIZE)
+
+@st.cache_resource
+def start_metrics_exporter():
+    # 프로세스당 1개의 스레드가 METRICS_INTERVAL 마다 지표 파일을 쓴다.
+    if METRICS_FORMAT != "off":
+        return metrics.start_exporter(METRICS_FILE, METRICS_FORMAT, METRICS_INTERVAL)
+
+@st.cache_resource
+def start_lead_notifier():
+    # 알림 대상이 설정된 경우에만 프로세스당 1개의 워커가 대기열을 보낸다 (재시작 전에 남은 알림부터).
+    if NOTIFY_WEBHOOK_URL:
+        sender = WebhookSender(NOTIFY_WEBHOOK_URL)
+    elif NOTIFY_SMTP_HOST:
+        sender = SmtpSender(NOTIFY_SMTP_HOST, NOTIFY_SMTP_PORT, NOTIFY_SMTP_FROM, NOTIFY_SMTP_TO,
+                            NOTIFY_SMTP_USER, NOTIFY_SMTP_PASSWORD, starttls=NOTIFY_SMTP_PORT == 587)
+    else:
+        return None
+    worker = NotificationWorker(NotificationQueue(NOTIFY_DB), sender)
+    worker.start()
+    return worker
+
+@st.cache_resource
+def preload_whatif():
+    # 첫 실행이 끝난 뒤 프로세스당 1회, What-if(numpy)를 백그라운드에서 미리 불러 둔다.
+    # 첫 화면은 numpy 없이 뜨고, 사용자가 입력하는 동안 끝나므로 첫 진단 제출도 import 를 기다리지 않는다.
+    thread = threading.Thread(target=importlib.import_module, args=("whatif",), name="preload-whatif", daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource(max_entries=1)
+def purge_expired_contacts(today: str):
+    # 날짜가 바뀐 뒤 첫 실행에서만(프로세스당 하루 1회) 보관 기간이 지난 내역을 파기한다.
+    # 월별 파티션이면 지난 달 파일을 지우는 것으로 끝난다.
+    before = retention_cutoff(CONTACT_RETENTION_MONTHS, date.fromisoformat(today))
+    with metrics.timer("contact_purge_seconds", backend=CONTACT_BACKEND):
+        n = get_contact_store().purge(before)
+        notifier = start_lead_notifier()
+        if notifier is not None:
+            notifier.queue.purge(before)  # 보내지 못한 알림에도 연락처가 들어 있다
+    metrics.inc("contacts_purged_total", n)
+    return before, n
+
+start_metrics_exporter()
+start_lead_notifier()
+purge_expired_contacts(date.today().isoformat())
+
+# ========= 사이드바 / 헤더 (정적 조각은 프로세스당 한 번만 만든다) =========
 with st.sidebar:
-    st.markdown("### 🧭 사용 방법")
-    st.markdown("- ① 기본정보 입력 → ② 추가 체크 → ③ 제출")
-    st.markdown("- 결과 하단 안내문구와 상담 신청을 확인하세요.")
-    st.markdown("---")
-    st.markdown("### ☎ 상담/문의")
-    st.markdown('<div class="sidebar-links">', unsafe_allow_html=True)
-    st.markdown(f"- 대표번호: **{CONTACT_PHONE}**")
-    st.markdown(f"- 블로그: [광명파트너스  블로그]({BLOG_URL})")
-    st.markdown(f"- 카카오채널: [바로 연결하기]({KAKAO_LINK})")
-    st.markdown('</div>', unsafe_allow_html=True)
-    st.caption("👉 상담은 무료이며, 실제 신청은 고객님 명의로만 진행됩니다.")
-
-# ========= 헤더 =========
-st.markdown("## 📊 광명파트너스 – 정책자금 맞춤 도우미")
-st.caption("정부 정책자금 진단 및 상담 연계 서비스")
-st.markdown(
-    f"📞 대표번호: **{CONTACT_PHONE}**  ·  🔗 블로그: [바로가기]({BLOG_URL})  ·  💬 카카오채널: [연결하기]({KAKAO_LINK})"
-)
-st.markdown("---")
-
-# ========= 유틸 =========
-def years_between(d: date, ref: date | None = None) -> float:
-    if ref is None: ref = date.today()
-    return (ref - d).days / 365.25
+    st.markdown(sidebar_markdown(BRAND, CONTACT_PHONE, BLOG_URL, KAKAO_LINK), unsafe_allow_html=True)
 
-def months_between(d: date, ref: date | None = None) -> float:
-    if ref is None: ref = date.today()
-    return (ref.year - d.year) * 12 + (ref.month - d.month) + (ref.day - d.day) / 30
+st.markdown(header_markdown(BRAND, CONTACT_PHONE, BLOG_URL, KAKAO_LINK), unsafe_allow_html=True)
 
+# ========= 유틸 =========
 def fmt_money(n: int) -> str:
     try:
         return f"{int(n):,}"
     except:
         return str(n)
 
+def count_render(section: str):
+    """세션별 영역 렌더 횟수 (프래그먼트 분리 효과 확인용, 관리자 영역에 표시).
+    프래그먼트 단독 실행이면 전송량도 이 영역 이름으로 따로 센다."""
+    counts = st.session_state.setdefault("render_counts", {})
+    counts[section] = counts.get(section, 0) + 1
+    ctx = get_script_run_ctx()
+    if ctx is not None and ctx.fragment_ids_this_run:
+        payload_meter().start(section, ctx)
+
+def rerun_section():
+    """프래그먼트 단독 실행 중이면 그 영역만, 전체 실행 중이면 앱 전체를 다시 실행한다."""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
 def build_date_or_error(year: int, month: int, day: int, label: str):
     try:
         return date(year, month, day), None
     except Exception:
         return None, f"{label}: 올바르지 않은 날짜입니다."
 
-# ✅ 직원 수 제한 (요청 반영)
-def employee_cap_ok(sector: str, emp: int) -> bool:
-    """
-    제조업, 건설업, 운송업(=운수·창고·통신업), 광업: 10인 미만
-    그 외 업종: 5인 미만
-    """
-    ten_cap_sectors = {"제조업", "건설업", "운수·창고·통신업", "광업"}
-    if sector in ten_cap_sectors:
-        return emp < 10
-    return emp < 5
-
 # ========= 입력 폼 =========
-with st.form("basic_form", clear_on_submit=False):
-    st.markdown('<div class="card">', unsafe_allow_html=True)
-    st.markdown("#### ① 기본정보")
-
-    c1, c2 = st.columns(2)
-    with c1:
-        biz_type = st.radio("사업자 유형", ["개인사업자", "법인사업자"], index=0, horizontal=True)
-    with c2:
-        region = st.text_input("사업장 지역 (예: 경기도 안산시)", "경기도 안산시")
-
-    st.markdown("**대표자 생년월일**")
-    by, bm, bd = st.columns(3)
-    with by: birth_year = st.number_input("연(Year)", 1900, 2025, 1980, step=1)
-    with bm: birth_month = st.number_input("월(Month)", 1, 12, 1, step=1)
-    with bd: birth_day = st.number_input("일(Day)", 1, 31, 1, step=1)
-
-    st.markdown("**개업 연월일**")
-    sy, sm, sd = st.columns(3)
-    with sy: biz_year = st.number_input("연(Year)", 1900, 2025, 2024, step=1, key="biz_y")
-    with sm: biz_month = st.number_input("월(Month)", 1, 12, 1, step=1, key="biz_m")
-    with sd: biz_day = st.number_input("일(Day)", 1, 31, 1, step=1, key="biz_d")
-
-    l1, l2 = st.columns(2)
-    with l1:
-        credit_nice = st.number_input("NICE 신용점수", 0, 1000, 700, step=1)
-        sales = st.number_input("연 매출 (원)", 0, step=1_000_000, value=100_000_000)
-        st.caption(f"입력값: {fmt_money(sales)} 원")
-    with l2:
-        credit_kcb  = st.number_input("KCB 신용점수", 0, 1000, 680, step=1)
-        loan_amount = st.number_input("현재 대출 총액 (원)", 0, step=1_000_000, value=0)
-        st.caption(f"입력값: {fmt_money(loan_amount)} 원")
-
-    assets = st.number_input("자산 총액 (부동산·주식·자동차·임차보증금 등)", 0, step=1_000_000, value=0)
-    st.caption(f"입력값: {fmt_money(assets)} 원")
-
-    # 업종=선택 / 업태=자유입력 (요청 반영)
-    t1, t2, t3 = st.columns(3)
-    with t1:
-        biz_sector = st.selectbox(
-            "사업자등록증상 **업종**",
-            [
-                "부동산 임대업",      # 상가, 건물, 오피스텔 임대 등
-                "서비스업",          # 미용실, 세탁, 피트니스, 학원, 컨설팅, 창업지원 등
-                "소매업",            # 편의점, 의류매장, 문구점, 식자재 마트 등
-                "음식점업",          # 식당, 카페, 치킨집, 분식점 등
-                "도매업",            # 식자재 유통, 중간 유통, 창고형 판매 등
-                "제조업",            # 가공식품, 공예품, 수제비누·화장품, 가구·목공 등
-                "운수·창고·통신업",   # 퀵서비스, 택배, 창고대여, 통신판매업 등
-                "건설업",            # 인테리어, 설비, 전기·소방공사 등
-                "광업",              # (요청 반영: 직원수 규칙 대상)
-                "기타업종",          # 숙박업, 교육업, 예술/여가 관련 등
-            ],
-            index=2,
-            help="업종은 목록에서 선택, 업태는 아래 칸에 직접 입력합니다."
-        )
-    with t2:
-        biz_item = st.text_input("사업자등록증상 **업태** (예: 한식 / 컨설팅 / 통신판매업 등)", "")
-    with t3:
-        employees = st.number_input("4대보험 직원 수", 0, step=1, value=0)
-
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    st.markdown('<div class="card">', unsafe_allow_html=True)
-    st.markdown("#### ② 추가 체크")
-
-    st.markdown("**혁신성장촉진자금 - 혁신형 해당 여부**")
-    a1, a2, a3 = st.columns(3)
-    with a1:
-        flag_export = st.checkbox("수출 실적 있음")
-        flag_growth10 = st.checkbox("최근 2년 연속 매출 10%↑")
-    with a2:
-        flag_smart_factory = st.checkbox("스마트공장 도입")
-        flag_strong_local  = st.checkbox("강한소상공인/로컬크리에이터")
-    with a3:
-        flag_postgrad = st.checkbox("졸업후보기업")
-
-    st.markdown("**혁신성장촉진자금 - 일반형 해당 여부**")
-    b1, b2, b3, b4 = st.columns(4)
-    with b1: flag_smart_tech = st.checkbox("스마트기술 활용")
-    with b2: flag_baeknyeon  = st.checkbox("백년소공인/백년가게")
-    with b3: flag_social     = st.checkbox("사회적경제기업")
-    with b4: flag_academy    = st.checkbox("신사업창업사관학교 수료(1년 이내)")
-
-    # 재도전특별자금
-    st.markdown("**재도전특별자금 해당 여부**")
-    c1, c2 = st.columns(2)
-    with c1:
-        flag_restartup = st.checkbox("재창업 경험 있음(폐업 후 재창업)")
-    with c2:
-        flag_debtrehab = st.checkbox("신용회복/채무조정 성실 이행 중 또는 이수")
-
-    # 일시적 경영애로 사유
-    st.markdown("**일시적 경영애로 사유**")
-    flag_distress = st.checkbox("매출 10% 이상 감소(또는 예외사유 증빙)")
-
-    submitted = st.form_submit_button("✅ ③ 제출하고 분석 결과 보기")
+def diagnosis_form():
+    """① 기본정보 · ② 추가 체크 입력 폼. (제출 여부, 입력값 dict) 를 돌려준다."""
+    with st.form("basic_form", clear_on_submit=False):
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown("#### ① 기본정보")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            biz_type = st.radio("사업자 유형", ["개인사업자", "법인사업자"], index=0, horizontal=True)
+        with c2:
+            region = st.text_input("사업장 지역 (예: 경기도 안산시)", "경기도 안산시")
+
+        st.markdown("**대표자 생년월일**")
+        by, bm, bd = st.columns(3)
+        with by: birth_year = st.number_input("연(Year)", 1900, 2025, 1980, step=1)
+        with bm: birth_month = st.number_input("월(Month)", 1, 12, 1, step=1)
+        with bd: birth_day = st.number_input("일(Day)", 1, 31, 1, step=1)
+
+        st.markdown("**개업 연월일**")
+        sy, sm, sd = st.columns(3)
+        with sy: biz_year = st.number_input("연(Year)", 1900, 2025, 2024, step=1, key="biz_y")
+        with sm: biz_month = st.number_input("월(Month)", 1, 12, 1, step=1, key="biz_m")
+        with sd: biz_day = st.number_input("일(Day)", 1, 31, 1, step=1, key="biz_d")
+
+        l1, l2 = st.columns(2)
+        with l1:
+            credit_nice = st.number_input("NICE 신용점수", 0, 1000, 700, step=1)
+            sales = st.number_input("연 매출 (원)", 0, step=1_000_000, value=100_000_000)
+            st.caption(f"입력값: {fmt_money(sales)} 원")
+        with l2:
+            credit_kcb  = st.number_input("KCB 신용점수", 0, 1000, 680, step=1)
+            loan_amount = st.number_input("현재 대출 총액 (원)", 0, step=1_000_000, value=0)
+            st.caption(f"입력값: {fmt_money(loan_amount)} 원")
+
+        assets = st.number_input("자산 총액 (부동산·주식·자동차·임차보증금 등)", 0, step=1_000_000, value=0)
+        st.caption(f"입력값: {fmt_money(assets)} 원")
+
+        # 업종=선택 / 업태=자유입력 (요청 반영)
+        t1, t2, t3 = st.columns(3)
+        with t1:
+            biz_sector = st.selectbox(
+                "사업자등록증상 **업종**",
+                [
+                    "부동산 임대업",      # 상가, 건물, 오피스텔 임대 등
+                    "서비스업",          # 미용실, 세탁, 피트니스, 학원, 컨설팅, 창업지원 등
+                    "소매업",            # 편의점, 의류매장, 문구점, 식자재 마트 등
+                    "음식점업",          # 식당, 카페, 치킨집, 분식점 등
+                    "도매업",            # 식자재 유통, 중간 유통, 창고형 판매 등
+                    "제조업",            # 가공식품, 공예품, 수제비누·화장품, 가구·목공 등
+                    "운수·창고·통신업",   # 퀵서비스, 택배, 창고대여, 통신판매업 등
+                    "건설업",            # 인테리어, 설비, 전기·소방공사 등
+                    "광업",              # (요청 반영: 직원수 규칙 대상)
+                    "기타업종",          # 숙박업, 교육업, 예술/여가 관련 등
+                ],
+                index=2,
+                help="업종은 목록에서 선택, 업태는 아래 칸에 직접 입력합니다."
+            )
+        with t2:
+            biz_item = st.text_input("사업자등록증상 **업태** (예: 한식 / 컨설팅 / 통신판매업 등)", "")
+        with t3:
+            employees = st.number_input("4대보험 직원 수", 0, step=1, value=0)
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown("#### ② 추가 체크")
+
+        st.markdown("**혁신성장촉진자금 - 혁신형 해당 여부**")
+        a1, a2, a3 = st.columns(3)
+        with a1:
+            flag_export = st.checkbox("수출 실적 있음")
+            flag_growth10 = st.checkbox("최근 2년 연속 매출 10%↑")
+        with a2:
+            flag_smart_factory = st.checkbox("스마트공장 도입")
+            flag_strong_local  = st.checkbox("강한소상공인/로컬크리에이터")
+        with a3:
+            flag_postgrad = st.checkbox("졸업후보기업")
+
+        st.markdown("**혁신성장촉진자금 - 일반형 해당 여부**")
+        b1, b2, b3, b4 = st.columns(4)
+        with b1: flag_smart_tech = st.checkbox("스마트기술 활용")
+        with b2: flag_baeknyeon  = st.checkbox("백년소공인/백년가게")
+        with b3: flag_social     = st.checkbox("사회적경제기업")
+        with b4: flag_academy    = st.checkbox("신사업창업사관학교 수료(1년 이내)")
+
+        # 재도전특별자금
+        st.markdown("**재도전특별자금 해당 여부**")
+        c1, c2 = st.columns(2)
+        with c1:
+            flag_restartup = st.checkbox("재창업 경험 있음(폐업 후 재창업)")
+        with c2:
+            flag_debtrehab = st.checkbox("신용회복/채무조정 성실 이행 중 또는 이수")
+
+        # 일시적 경영애로 사유
+        st.markdown("**일시적 경영애로 사유**")
+        flag_distress = st.checkbox("매출 10% 이상 감소(또는 예외사유 증빙)")
+
+        submitted = st.form_submit_button("✅ ③ 제출하고 분석 결과 보기")
+    return submitted, {
+        "biz_type": biz_type, "region": region, "birth_year": birth_year,
+        "birth_month": birth_month, "birth_day": birth_day, "biz_year": biz_year,
+        "biz_month": biz_month, "biz_day": biz_day, "credit_nice": credit_nice, "sales": sales,
+        "credit_kcb": credit_kcb, "loan_amount": loan_amount, "assets": assets,
+        "biz_sector": biz_sector, "biz_item": biz_item, "employees": employees,
+        "flag_export": flag_export, "flag_growth10": flag_growth10,
+        "flag_smart_factory": flag_smart_factory, "flag_strong_local": flag_strong_local,
+        "flag_postgrad": flag_postgrad, "flag_smart_tech": flag_smart_tech,
+        "flag_baeknyeon": flag_baeknyeon, "flag_social": flag_social, "flag_academy": flag_academy,
+        "flag_restartup": flag_restartup, "flag_debtrehab": flag_debtrehab,
+        "flag_distress": flag_distress,
+    }
 
 # ========= 분석 출력 =========
-def show_results_and_notice(birth, biz_start):
-    # 입력 요약
-    st.markdown('<div class="card">', unsafe_allow_html=True)
-    st.markdown("#### 🧾 입력 요약")
-    c1, c2, c3 = st.columns(3)
-    with c1:
-        st.write(f"- 사업자 유형: **{biz_type}**")
-        st.write(f"- 지역: **{region}**")
-        st.write(f"- 업종/업태: **{biz_sector} / {biz_item}**")
-    with c2:
-        st.write(f"- 대표자 생년월일: **{birth.isoformat()}**")
-        st.write(f"- 개업 연월일: **{biz_start.isoformat()}**")
-        st.write(f"- 직원 수: **{employees}명**")
-    with c3:
-        st.write(f"- NICE/KCB: **{credit_nice} / {credit_kcb}**")
-        st.write(f"- 연 매출: **{fmt_money(sales)}원**")
-        st.write(f"- 대출/자산: **{fmt_money(loan_amount)}원 / {fmt_money(assets)}원**")
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    st.markdown("### 🔎 분석 결과")
-    age = int(years_between(birth))
-    biz_months = months_between(biz_start)
-
-    results = []
-    # 최소 게이트(요청 반영: 직원수 제한 포함)
-    if (
-        (sales >= 10_000_000)
-        and (credit_nice > 515)
-        and (credit_kcb > 454)
-        and (biz_months >= 3)
-        and employee_cap_ok(biz_sector, employees)
-    ):
-        # 일반경영안정자금
-        if (credit_nice >= 665) and (credit_kcb >= 630):
-            results.append({
-                "name":"일반경영안정자금",
-                "range":"2,000만원 ~ 7,000만원",
-                "rate":"연 3.28% (기준 2.68% +0.6%p)",
-                "notes":"은행 및 보증 조건에 따라 실금리는 달라질 수 있습니다.",
-                "link":"https://ols.sbiz.or.kr/"
-            })
-        # 신용취약 소상공인자금
-        if (515 <= credit_nice <= 839) or (515 <= credit_kcb <= 839):
-            results.append({
-                "name":"신용취약 소상공인자금",
-                "range":"최대 3,000만원 (연 1회)",
-                "rate":"연 4.28% (기준 2.68% +1.6%p)",
-                "notes":"신용관리교육 필수. 세부 한도/조건은 심사에 따라 달라집니다.",
-                "link":"https://ols.sbiz.or.kr/"
-            })
-        # 청년 전용 자금
-        if age <= 39 and (credit_nice >= 620 and credit_kcb >= 620):
-            results.append({
-                "name":"청년 전용 자금(공고별)",
-                "range":"공고별 한도 (예: 1~2억원)",
-                "rate":"연 2.68% (기준 2.68% +0.0%p)",
-                "notes":"세부요건·금리는 공고마다 상이합니다.",
-                "link":"https://www.kosmes.or.kr/"
-            })
-        # 혁신성장촉진자금
-        if any([
-            flag_export, flag_growth10, flag_smart_factory, flag_strong_local, flag_postgrad,
-            flag_smart_tech, flag_baeknyeon, flag_social, flag_academy
-        ]):
-            results.append({
-                "name":"혁신성장촉진자금",
-                "range":"운전 2억원 / 시설 10억원 (예시)",
-                "rate":"연 3.08% (기준 2.68% +0.4%p)",
-                "notes":"혁신형/일반형 증빙 필요. 금리는 유형·공고에 따라 달라질 수 있습니다.",
-                "link":"https://www.sbiz24.kr/"
-            })
-        # 일시적 경영애로자금 (매출 상한 1억 400만원)
-        if flag_distress and (sales <= 104_000_000):
-            results.append({
-                "name":"일시적 경영애로자금",
-                "range":"최대 7,000만원",
-                "rate":"연 2.68% (기준 2.68% +0.0%p)",
-                "notes":"매출감소 등 일시적 애로 사유를 증빙해야 합니다.",
-                "link":"https://ols.sbiz.or.kr/"
-            })
-        # 재도전특별자금 (둘 중 하나 충족)
-        if (flag_restartup or flag_debtrehab):
-            results.append({
-                "name":"재도전특별자금",
-                "range":"희망형 최대 1억원 / 일반형 최대 7천만원",
-                "rate":"희망형 연 3.28% (기준 2.68% +0.6%p) / 일반형 연 4.28% (기준 2.68% +1.6%p)",
-                "notes":"재창업·채무조정 성실 이행 등 재도약 소상공인 대상. 5년(2년 거치+3년 분할). 우대금리 최대 0.6%p 감면.",
-                "link":"https://ols.sbiz.or.kr/"
-            })
-
-    # 출력
-    if results:
-        for r in results:
-            st.markdown(f"""<div class="result-card">
-                <div style='display:flex;justify-content:space-between;align-items:center;'>
-                    <div style='font-size:16px; font-weight:800;'>{r['name']}</div>
-                    <span class="badge">분석</span>
-                </div>
-                <div class='small'>예상 한도: <b>{r['range']}</b></div>
-                <div class='small'>예상 금리: <b>{r['rate']}</b></div>
-                <hr class="soft" />
-                <div class='small'>{r['notes']}</div>
-                <div style='margin-top:6px;'>👉 <a href="{r.get('link','')}" target="_blank">신청 안내 바로가기</a></div>
-            </div>""", unsafe_allow_html=True)
-    else:
-        msg=[]
-        if sales < 10_000_000:
-            msg.append("연 매출 1,000만원 미만")
-        if credit_nice <= 515 or credit_kcb <= 454:
-            msg.append("신용점수 낮음(NICE 515 이하 또는 KCB 454 이하)")
-        if months_between(biz_start) < 3:
-            msg.append("개업 3개월 미만")
-        # 직원 수 제한 사유 추가
-        if not employee_cap_ok(biz_sector, employees):
-            if biz_sector in {"제조업", "건설업", "운수·창고·통신업", "광업"} and employees >= 10:
-                msg.append("해당 업종(제조/건설/운송/광업) 4대보험 직원 10인 이상")
-            elif employees >= 5:
-                msg.append("4대보험 직원 5인 이상")
-        st.info("현재 조건에 맞는 자금을 찾지 못했습니다." + (" ("+" · ".join(msg)+")" if msg else ""))
-
-    # 안내 박스
-    st.markdown("""
-<div style="border-left:6px solid #1f6feb;background:#eaf2ff;padding:14px 16px;border-radius:8px;margin:12px 0 4px 0;">
-<b>안내</b><br/>
-💡 정책자금 승인 여부와 조건은 신용 점수나 매출뿐 아니라 <b>사업계획서·기술력·대표자 상황</b> 등에 따라 달라질 수 있습니다.
-또한 <b>복수 자금 활용</b>, <b>시차를 둔 추가 신청</b> 등 운용 방식에 따라 결과가 달라질 수 있습니다.<br/><br/>
-※ 본 자료는 참고용이며, 실제 심사는 기관 정책 및 신청인 신용 상태에 따라 달라질 수 있습니다.
-</div>
-""", unsafe_allow_html=True)
-
-if submitted:
-    birth, e1 = build_date_or_error(int(birth_year), int(birth_month), int(birth_day), "대표자 생년월일")
-    start, e2 = build_date_or_error(int(biz_year), int(biz_month), int(biz_day), "개업 연월일")
-    if e1: st.error(e1)
-    if e2: st.error(e2)
-    if not (e1 or e2):
-        show_results_and_notice(birth, start)
+def current_applicant(form: dict, birth, biz_start) -> dict:
+    """폼 입력값을 eligibility 판정용 dict 로 묶는다."""
+    applicant = {k: form[k] for k in INPUT_COLUMNS if k in form}
+    applicant.update(birth=birth, biz_start=biz_start)
+    return applicant
+
+def normalized_form(form: dict) -> dict:
+    """캐시 키·화면 표시용 입력값 (글자는 앞뒤 공백 제거, 정수로 떨어지는 숫자는 int)."""
+    out = {}
+    for k, v in form.items():
+        if isinstance(v, str):
+            v = v.strip()
+        elif isinstance(v, float) and v.is_integer():
+            v = int(v)
+        out[k] = v
+    return out
+
+def build_results(form: dict, applicant: dict, catalog, today: date) -> tuple:
+    """(해당 자금 목록, 결과 HTML). 같은 날 같은 입력이 캐시에 없을 때만 실행된다."""
+    results = match_funds(applicant, ref=today, catalog=catalog)
+    reasons = [] if results else rejection_reasons(applicant, ref=today, catalog=catalog)
+    # 조건이 바뀌면 해당될 수 있는 자금 (격자 변형을 한 번에 판정). numpy 를 쓰므로 첫 실행 뒤 미리 불러 둔다(preload_whatif).
+    from whatif import simulate
+    hints = simulate(applicant, ref=today, catalog=catalog)
+
+    birth, biz_start = applicant["birth"], applicant["biz_start"]
+    summary = [
+        [("사업자 유형", form["biz_type"]), ("지역", form["region"]),
+         ("업종/업태", f"{form['biz_sector']} / {form['biz_item']}")],
+        [("대표자 생년월일", birth.isoformat()), ("개업 연월일", biz_start.isoformat()),
+         ("직원 수", f"{form['employees']}명")],
+        [("NICE/KCB", f"{form['credit_nice']} / {form['credit_kcb']}"), ("연 매출", f"{fmt_money(form['sales'])}원"),
+         ("대출/자산", f"{fmt_money(form['loan_amount'])}원 / {fmt_money(form['assets'])}원")],
+    ]
+    return results, results_html(summary, results, reasons, hints, catalog.version)
+
+@metrics.timed("results_seconds")
+def show_results_and_notice(form: dict, birth, biz_start):
+    form = normalized_form(form)
+    applicant = current_applicant(form, birth, biz_start)
+    catalog = get_catalog_cache().get()
+    today = date.today()
+    # 카탈로그가 바뀌면 버전이 달라지므로 이전 기준의 결과는 다시 쓰이지 않는다.
+    key = (catalog.version, birth, biz_start, tuple(sorted(form.items())))
+    (results, html), _ = get_result_cache().get_or_compute(
+        key, lambda: build_results(form, applicant, catalog, today), today,
+    )
+    for r in results:
+        metrics.inc("fund_matches_total", fund=r["name"])
+    if not results:
+        metrics.inc("diagnosis_no_match_total")
+    with metrics.timer("lead_stats_seconds", event="diagnosis"):
+        get_lead_stats().record_diagnosis([r["id"] for r in results])
+    st.session_state["diagnosed"] = True  # 상담 신청 시 전환 퍼널 집계용
+    # 입력 요약 · 자금 카드 · What-if · 안내 박스를 델타 1개로 보낸다.
+    st.markdown(html, unsafe_allow_html=True)
+
+@st.fragment
+@metrics.timed("section_seconds", section="진단")
+def diagnosis_section():
+    # 이 영역의 입력/제출은 이 함수만 다시 실행한다 (사이드바·상담·관리자 영역은 그대로).
+    count_render("진단")
+    submitted, form = diagnosis_form()
+    if submitted:
+        metrics.inc("diagnosis_submissions_total")
+        birth, e1 = build_date_or_error(int(form["birth_year"]), int(form["birth_month"]), int(form["birth_day"]), "대표자 생년월일")
+        start, e2 = build_date_or_error(int(form["biz_year"]), int(form["biz_month"]), int(form["biz_day"]), "개업 연월일")
+        if e1: st.error(e1)
+        if e2: st.error(e2)
+        if not (e1 or e2):
+            show_results_and_notice(form, birth, start)
 
 # ========= 상담 신청(개인정보 동의) =========
-st.markdown("### 📞 상담 신청하기")
-st.caption("정확한 심사 가능 여부와 맞춤 전략은 상담을 통해 확인할 수 있습니다.")
-
-agree = st.checkbox("✅ 개인정보 수집·이용에 동의합니다.", help=(
-    "수집 항목: 이름, 연락처, 메모(선택)\n"
-    "수집 목적: 정책자금 상담 신청 접수 및 연락\n"
-    "보유 기간: 상담 종료 후 1년 이내 파기\n"
-    "동의를 거부할 권리가 있으며, 미동의 시 상담 신청이 제한될 수 있습니다."
-))
-
-with st.form("contact_form", clear_on_submit=True):
-    name = st.text_input("이름")
-    phone = st.text_input("연락처 (휴대폰 번호)")
-    memo = st.text_area("추가 메모 (선택)")
-    submit_contact = st.form_submit_button("📩 상담 신청하기", disabled=not agree)
-
-if submit_contact:
-    if not agree:
-        st.error("개인정보 수집·이용 동의가 필요합니다.")
-    elif not name or not phone:
-        st.error("이름과 연락처는 필수 입력입니다.")
-    else:
-        append_contact_csv(name, phone, memo)
-        st.success("✅ 상담 신청이 접수되었습니다. 담당자 확인 후 빠르게 연락드리겠습니다.")
+@st.fragment
+@metrics.timed("section_seconds", section="상담")
+def contact_section():
+    count_render("상담")
+    st.markdown("### 📞 상담 신청하기")
+    st.caption("정확한 심사 가능 여부와 맞춤 전략은 상담을 통해 확인할 수 있습니다.")
+
+    agree = st.checkbox("✅ 개인정보 수집·이용에 동의합니다.", help=(
+        "수집 항목: 이름, 연락처, 메모(선택)\n"
+        "수집 목적: 정책자금 상담 신청 접수 및 연락\n"
+        "보유 기간: 상담 종료 후 1년 이내 파기\n"
+        "동의를 거부할 권리가 있으며, 미동의 시 상담 신청이 제한될 수 있습니다."
+    ))
+
+    with st.form("contact_form", clear_on_submit=True):
+        name = st.text_input("이름")
+        phone = st.text_input("연락처 (휴대폰 번호)")
+        memo = st.text_area("추가 메모 (선택)")
+        submit_contact = st.form_submit_button("📩 상담 신청하기", disabled=not agree)
+
+    if submit_contact:
+        if not agree:
+            st.error("개인정보 수집·이용 동의가 필요합니다.")
+        elif not name or not phone:
+            st.error("이름과 연락처는 필수 입력입니다.")
+        elif len(phone_key(phone)) < 8:
+            st.error("연락처 형식을 확인해 주세요. (예: 010-1234-5678)")
+        else:
+            store = get_contact_store()
+            cutoff = (date.today() - timedelta(days=CONTACT_DUP_DAYS)).isoformat()
+            if store.find_phone(phone, since=cutoff):
+                metrics.inc("contact_duplicates_total")
+                st.info("✅ 이미 접수된 연락처입니다. 담당자 확인 후 빠르게 연락드리겠습니다.")
+            else:
+                with metrics.timer("contact_append_seconds", backend=CONTACT_BACKEND):
+                    store.append(name, phone, memo)
+                metrics.inc("contact_submissions_total")
+                diagnosed = st.session_state.get("diagnosed", False)
+                with metrics.timer("lead_stats_seconds", event="contact"):
+                    get_lead_stats().record_contact(after_diagnosis=diagnosed)
+                notifier = start_lead_notifier()
+                if notifier is not None:
+                    # 대기열에 넣기만 하고 전송은 워커가 한다 (외부 서비스 응답을 기다리지 않음).
+                    with metrics.timer("notify_enqueue_seconds"):
+                        notifier.queue.enqueue({"name": name, "phone": normalize_phone(phone), "memo": memo,
+                                                "applied_on": date.today().isoformat(), "after_diagnosis": diagnosed})
+                    notifier.wake()
+                st.success("✅ 상담 신청이 접수되었습니다. 담당자 확인 후 빠르게 연락드리겠습니다.")
+
+diagnosis_section()
+contact_section()
 
 # ========= 하단 연락처 =========
 st.markdown("---")
@@ -379,62 +422,191 @@ st.markdown(f"- 카카오채널: [바로 연결하기]({KAKAO_LINK})")
 
 # ========= 관리자 전용(조회/선택삭제/초기화/다운로드) =========
 st.markdown("---")
-with st.expander("🔒 관리자 전용 (상담 신청 내역 조회/다운로드/삭제)"):
-    pin = st.text_input("관리자 PIN을 입력하세요", type="password")
-    if pin == ADMIN_PIN:
-        st.success("관리자 인증 완료 ✅")
-        st.caption(f"저장 파일 경로: `{CONTACTS_CSV}`")
-
-        df = load_contacts_df()
-        if df.empty:
-            st.info("현재 저장된 내역이 없습니다.")
-        else:
-            editor_df = df.copy()
-            editor_df["선택"] = False
-            edited = st.data_editor(
-                editor_df,
-                hide_index=True,
-                column_config={
-                    "선택": st.column_config.CheckboxColumn("선택", help="삭제할 행을 체크하세요."),
-                    "이름": st.column_config.TextColumn("이름", disabled=True),
-                    "연락처": st.column_config.TextColumn("연락처", disabled=True),
-                    "메모": st.column_config.TextColumn("메모", disabled=True),
-                    "신청일": st.column_config.TextColumn("신청일", disabled=True),
-                },
-                use_container_width=True,
-                key="admin_editor",
-            )
-            to_delete = edited[edited["선택"] == True].drop(columns=["선택"])
-
-            d1, d2, d3 = st.columns([1,1,6])
-            with d1:
-                del_btn = st.button(f"🗑️ 선택 행 삭제 ( {len(to_delete)} 건 )", type="primary", disabled=to_delete.empty)
-            with d2:
-                wipe_btn = st.button("🧹 전체 삭제(초기화)")
-            with d3:
-                refresh_btn = st.button("🔄 새로고침")
-
-            if del_btn and not to_delete.empty:
-                merged = df.merge(to_delete, how="left", indicator=True)
-                new_df = merged[merged["_merge"] == "left_only"].drop(columns=["_merge"])
-                new_df.to_csv(CONTACTS_CSV, index=False, encoding="utf-8-sig")
-                st.success(f"✅ {len(to_delete)}건 삭제 완료")
-                st.rerun()
-
-            if wipe_btn:
-                CONTACTS_CSV.unlink(missing_ok=True)
-                st.success("✅ 모든 상담 신청 내역을 삭제했습니다.")
-                st.rerun()
-
-            if refresh_btn:
-                st.rerun()
-
-            csv_bytes = df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
-            st.download_button("⬇️ CSV 다운로드", data=csv_bytes, file_name="contacts.csv", mime="text/csv")
-    elif pin:
-        st.error("PIN이 올바르지 않습니다.")
+
+def export_panel(store):
+    """다운로드 파일은 버튼을 눌렀을 때만 저장소에서 chunk 단위로 만든다."""
+    e1, e2, e3 = st.columns([2, 3, 2])
+    with e1:
+        period = st.selectbox("기간", list(PERIODS) + ["기간 지정"], key="export_period")
+    if period == "기간 지정":
+        with e2:
+            picked = st.date_input("신청일 범위", value=(date.today() - timedelta(days=29), date.today()), key="export_range")
+        if len(picked) != 2:
+            return
+        start, end = picked[0].isoformat(), picked[1].isoformat()
+    else:
+        start, end = period_range(PERIODS[period])
+    with e3:
+        fmt = st.selectbox("형식", available_formats(), key="export_format")
+    st.download_button(
+        "⬇️ 다운로드",
+        data=lambda: export_bytes(store, fmt, start, end),
+        file_name=file_name(fmt, start, end),
+        mime=FORMATS[fmt][1],
+        on_click="ignore",
+    )
+
+def analytics_panel():
+    """누적 집계만 읽으므로 내역 건수와 무관하게 같은 시간에 그린다."""
+    st.markdown("#### 📊 리드 분석")
+    stats = get_lead_stats()
+    totals = stats.totals()
+    diag, contact, after = (totals.get(k, 0) for k in ("diagnosis", "contact", "contact_after_diagnosis"))
+    m1, m2, m3 = st.columns(3)
+    m1.metric("진단 제출 (누적)", f"{diag:,}")
+    m2.metric("상담 신청 (누적)", f"{contact:,}")
+    m3.metric("진단 → 상담 전환율", f"{after / diag:.1%}" if diag else "-", help="같은 세션에서 진단 후 상담을 신청한 비율")
+
+    series = {"diagnosis": "진단 제출", "contact": "상담 신청"}
+    t1, t2, t3 = st.tabs(["일별 (30일)", "주별 (12주)", "자금별 해당"])
+    with t1:
+        st.line_chart(stats.daily_series(series, 30), x="일자", y=list(series.values()))
+    with t2:
+        st.bar_chart(stats.weekly_series(series, 12), x="주", y=list(series.values()), stack=False)
+    with t3:
+        names = {f["id"]: f["name"] for f in get_catalog_cache().get().funds}
+        funds = {names.get(k[5:], k[5:]): n for k, n in totals.items() if k.startswith("fund:")}
+        funds["해당 없음"] = totals.get("no_match", 0)
+        st.bar_chart({"자금": list(funds), "건수": list(funds.values())}, x="자금", y="건수", horizontal=True)
+
+def metrics_panel():
+    """프로세스 누적 지표 (모든 세션 합계)와 이 세션 프로파일링."""
+    st.markdown("#### 📈 운영 지표")
+    snap = metrics.snapshot()
+    st.dataframe(
+        [{"지표": t["name"], "구분": " ".join(t["labels"].values()), "횟수": t["count"],
+          "p50 (ms)": round(t["p50"] * 1000, 2), "p95 (ms)": round(t["p95"] * 1000, 2), "최대 (ms)": round(t["max"] * 1000, 2)}
+         for t in snap["timers"]],
+        hide_index=True, width="stretch",
+    )
+    submits = metrics.counter_value("diagnosis_submissions_total")
+    funds = [c for c in snap["counters"] if c["name"] == "fund_matches_total"]
+    st.caption(
+        f"진단 제출 {submits:,.0f}건 · 상담 신청 {metrics.counter_value('contact_submissions_total'):,.0f}건 · "
+        f"해당 자금 없음 {metrics.counter_value('diagnosis_no_match_total'):,.0f}건"
+    )
+    cache = get_result_cache().stats()
+    lookups = cache["hits"] + cache["misses"]
+    st.caption(f"진단 결과 캐시: {cache['size']:,}/{cache['maxsize']:,}항목 · 적중 {cache['hits']:,}/{lookups:,}"
+               + (f" ({cache['hits'] / lookups:.0%})" if lookups else ""))
+    if submits and funds:
+        st.caption("자금별 해당률: " + " · ".join(f"{c['labels']['fund']} {c['value'] / submits:.0%}" for c in funds))
+    st.caption(f"지표 파일: `{METRICS_FILE}` ({METRICS_INTERVAL}초마다)" if METRICS_FORMAT != "off" else "지표 파일: 꺼짐")
+
+    if st.toggle("이 세션 프로파일링 (cProfile, 다음 전체 실행부터)", key="profile_on"):
+        profiler = st.session_state["profiler"]
+        if profiler.error:
+            st.warning(f"프로파일러를 켜지 못했습니다: {profiler.error}")
+        elif profiler.report:
+            st.code(profiler.report, language=None)
+
+@st.fragment
+@metrics.timed("section_seconds", section="관리자")
+def admin_section():
+    count_render("관리자")
+    with st.expander("🔒 관리자 전용 (상담 신청 내역 조회/다운로드/삭제)"):
+        pin = st.text_input("관리자 PIN을 입력하세요", type="password")
+        if pin == ADMIN_PIN:
+            st.success("관리자 인증 완료 ✅")
+            counts = st.session_state.get("render_counts", {})
+            st.caption("렌더 횟수(이 세션): " + " · ".join(f"{k} {v}" for k, v in counts.items()))
+            meter = payload_meter()
+            sent = [(label, meter.last(label)) for label in ("전체", "진단", "상담", "관리자")]
+            st.caption("전송량(직전 실행): " + " · ".join(
+                f"{label} {run['bytes']:,}B/{run['msgs']}건" for label, run in sent if run))
+            store = get_contact_store()
+            before, purged = purge_expired_contacts(date.today().isoformat())
+            st.caption(f"저장 위치: `{store.location}` · {before} 이전 신청분 파기 (오늘 {purged:,}건)")
+            catalogs = get_catalog_cache()
+            st.caption(f"정책 카탈로그: `{catalogs.path.name}` {catalogs.get().version}")
+            if catalogs.error:
+                st.warning(f"카탈로그 변경분을 적용하지 못해 이전 버전을 사용 중입니다: {catalogs.error}")
+            notifier = start_lead_notifier()
+            if notifier is None:
+                st.caption("신청 알림: 꺼짐 (NOTIFY_WEBHOOK_URL 또는 NOTIFY_SMTP_HOST 설정 시 사용)")
+            else:
+                q = notifier.queue.stats()
+                st.caption(f"신청 알림: {notifier.sender.name} · 대기 {q['pending']:,}건 (재시도 중 {q['retrying']:,}) · "
+                           f"실패 보관 {q['dead']:,}건")
+                if q["dead"]:
+                    st.warning(f"보내지 못한 알림이 있습니다. `python notify.py requeue --db {NOTIFY_DB}` 로 다시 보낼 수 있습니다.")
+
+            with metrics.timer("contact_load_seconds", backend=CONTACT_BACKEND, op="count"):
+                total = store.count()
+            query = "" if total == 0 else st.text_input("🔎 이름 또는 연락처 검색", key="admin_search", placeholder="예: 길동, 5678").strip()
+            if total == 0:
+                st.info("현재 저장된 내역이 없습니다.")
+            else:
+                if query:
+                    with metrics.timer("contact_load_seconds", backend=CONTACT_BACKEND, op="search"):
+                        page_df = store.search(query, ADMIN_PAGE_SIZE)
+                    st.caption(f"검색 결과 {len(page_df):,}건 · 최근 신청 순 · 최대 {ADMIN_PAGE_SIZE}건")
+                    editor_key = f"admin_editor_q_{query}"
+                else:
+                    pages = (total - 1) // ADMIN_PAGE_SIZE + 1
+                    p1, p2 = st.columns([1, 5])
+                    with p1:
+                        page_no = st.number_input("페이지", 1, pages, 1, step=1, key="admin_page")
+                    with p2:
+                        st.caption(f"총 {total:,}건 · 최근 신청 순 · {ADMIN_PAGE_SIZE}건씩 ({page_no}/{pages} 페이지)")
+                    with metrics.timer("contact_load_seconds", backend=CONTACT_BACKEND, op="page"):
+                        page_df = store.page(ADMIN_PAGE_SIZE, (int(page_no) - 1) * ADMIN_PAGE_SIZE)
+                    editor_key = f"admin_editor_{page_no}"
+
+                editor_df = page_df.copy()
+                editor_df["선택"] = False
+                edited = st.data_editor(
+                    editor_df,
+                    hide_index=True,
+                    column_config={
+                        "선택": st.column_config.CheckboxColumn("선택", help="삭제할 행을 체크하세요."),
+                        "이름": st.column_config.TextColumn("이름", disabled=True),
+                        "연락처": st.column_config.TextColumn("연락처", disabled=True),
+                        "메모": st.column_config.TextColumn("메모", disabled=True),
+                        "신청일": st.column_config.TextColumn("신청일", disabled=True),
+                    },
+                    use_container_width=True,
+                    key=editor_key,
+                )
+                to_delete = edited.index[edited["선택"] == True]
+
+                d1, d2, d3 = st.columns([1,1,6])
+                with d1:
+                    del_btn = st.button(f"🗑️ 선택 행 삭제 ( {len(to_delete)} 건 )", type="primary", disabled=to_delete.empty)
+                with d2:
+                    wipe_btn = st.button("🧹 전체 삭제(초기화)")
+                with d3:
+                    refresh_btn = st.button("🔄 새로고침")
+
+                if del_btn and not to_delete.empty:
+                    with metrics.timer("admin_action_seconds", action="delete"):
+                        n = store.delete(to_delete.tolist())
+                    st.success(f"✅ {n}건 삭제 완료")
+                    rerun_section()
+
+                if wipe_btn:
+                    with metrics.timer("admin_action_seconds", action="wipe"):
+                        store.wipe()
+                    st.success("✅ 모든 상담 신청 내역을 삭제했습니다.")
+                    rerun_section()
+
+                if refresh_btn:
+                    rerun_section()
+
+                export_panel(store)
+            analytics_panel()
+            metrics_panel()
+        elif pin:
+            st.error("PIN이 올바르지 않습니다.")
+
+admin_section()
 
 # ========= 푸터 =========
 st.caption(f"ⓒ {date.today().year} {BRAND}")
 
+metrics.observe("rerun_seconds", time.perf_counter() - RUN_STARTED, scope="전체")
+metrics.observe_once("first_run_seconds", time.perf_counter() - RUN_STARTED)  # 기동 직후 첫 요청 지연
+profiler.stop()
+preload_whatif()
+
 
@@ -0,0 +1,207 @@
+# metrics.py
+"""
+경량 계측 (프로세스 공용, 외부 의존성 없음).
+
+    with metrics.timer("contact_append_seconds", backend="sqlite"):
+        store.append(...)
+
+    @metrics.timed("results_seconds")
+    def show_results(...): ...
+
+    metrics.inc("fund_matches_total", fund="일반경영안정자금")
+
+- 타이머: 횟수·합계·최대 + 최근 RESERVOIR 개 표본으로 p50/p95
+- 카운터: 누적 값
+- prometheus_text() / jsonl_record() 로 내보내고, start_exporter() 가 주기적으로 파일에 쓴다.
+- SessionProfiler: 세션별 cProfile (관리자 영역에서 켠 세션만 오버헤드가 생긴다)
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PREFIX = "policy_app_"
+RESERVOIR = 1024
+
+_LOCK = threading.Lock()
+_COUNTERS = {}  # (이름, 라벨) → 값
+_TIMERS = {}    # (이름, 라벨) → {"count", "sum", "max", "recent"}
+_STARTED = time.time()
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted(labels.items()))
+
+
+# ========= 기록 =========
+def inc(name: str, value: float = 1, **labels):
+    key = _key(name, labels)
+    with _LOCK:
+        _COUNTERS[key] = _COUNTERS.get(key, 0) + value
+
+def observe(name: str, seconds: float, **labels):
+    key = _key(name, labels)
+    with _LOCK:
+        t = _TIMERS.get(key)
+        if t is None:
+            t = _TIMERS[key] = {"count": 0, "sum": 0.0, "max": 0.0, "recent": deque(maxlen=RESERVOIR)}
+        t["count"] += 1
+        t["sum"] += seconds
+        t["max"] = max(t["max"], seconds)
+        t["recent"].append(seconds)
+
+def observe_once(name: str, seconds: float, **labels) -> bool:
+    """프로세스에서 처음 한 번만 기록한다 (콜드 스타트 지표용). 기록했으면 True."""
+    key = _key(name, labels)
+    with _LOCK:
+        if key in _TIMERS:
+            return False
+    observe(name, seconds, **labels)
+    return True
+
+@contextmanager
+def timer(name: str, **labels):
+    """블록 실행 시간을 기록한다 (예외·st.rerun 으로 빠져나가도 기록)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+def timed(name: str, **labels):
+    """함수 실행 시간을 기록하는 데코레이터."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(name, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+# ========= 조회 =========
+def _quantile(values: list, q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def counter_value(name: str, **labels) -> float:
+    with _LOCK:
+        return _COUNTERS.get(_key(name, labels), 0)
+
+def snapshot() -> dict:
+    """{"uptime", "counters": [...], "timers": [...]} (timers 의 시간 단위는 초)."""
+    with _LOCK:
+        counters = [{"name": n, "labels": dict(l), "value": v} for (n, l), v in _COUNTERS.items()]
+        timers = [(n, dict(l), dict(t, recent=sorted(t["recent"]))) for (n, l), t in _TIMERS.items()]
+    return {
+        "uptime": time.time() - _STARTED,
+        "counters": sorted(counters, key=lambda c: (c["name"], sorted(c["labels"].items()))),
+        "timers": [
+            {"name": n, "labels": l, "count": t["count"], "sum": t["sum"], "max": t["max"],
+             "p50": _quantile(t["recent"], 0.5), "p95": _quantile(t["recent"], 0.95)}
+            for n, l, t in sorted(timers, key=lambda x: (x[0], sorted(x[1].items())))
+        ],
+    }
+
+
+# ========= 내보내기 =========
+def _labels_text(labels: dict, **extra) -> str:
+    items = {**labels, **extra}
+    if not items:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in items.items()) + "}"
+
+def prometheus_text(snap: dict | None = None) -> str:
+    """Prometheus text exposition 형식 (타이머는 summary 와 별도 _max gauge)."""
+    if snap is None: snap = snapshot()
+    families = {}  # 이름 → (type, [줄]) ; 같은 이름의 줄은 한 묶음으로 모아야 한다.
+
+    def add(name, kind, line):
+        families.setdefault(name, (kind, []))[1].append(line)
+
+    add(f"{PREFIX}uptime_seconds", "gauge", f"{PREFIX}uptime_seconds {snap['uptime']:.3f}")
+    for c in snap["counters"]:
+        name = PREFIX + c["name"]
+        add(name, "counter", f"{name}{_labels_text(c['labels'])} {c['value']}")
+    for t in snap["timers"]:
+        name, labels = PREFIX + t["name"], t["labels"]
+        add(name, "summary", f"{name}{_labels_text(labels, quantile='0.5')} {t['p50']:.6f}")
+        add(name, "summary", f"{name}{_labels_text(labels, quantile='0.95')} {t['p95']:.6f}")
+        add(name, "summary", f"{name}_sum{_labels_text(labels)} {t['sum']:.6f}")
+        add(name, "summary", f"{name}_count{_labels_text(labels)} {t['count']}")
+        add(f"{name}_max", "gauge", f"{name}_max{_labels_text(labels)} {t['max']:.6f}")
+    lines = []
+    for name, (kind, rows) in families.items():
+        lines.append(f"# TYPE {name} {kind}")
+        lines += rows
+    return "\n".join(lines) + "\n"
+
+def jsonl_record(snap: dict | None = None) -> str:
+    if snap is None: snap = snapshot()
+    return json.dumps({"ts": datetime.now().isoformat(timespec="seconds"), **snap}, ensure_ascii=False)
+
+def write_metrics(path, fmt: str = "prom"):
+    """prom: 파일을 통째로 교체(node_exporter textfile 용) / jsonl: 한 줄 추가."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "jsonl":
+        with path.open("a", encoding="utf-8") as f:
+            f.write(jsonl_record() + "\n")
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(prometheus_text(), encoding="utf-8")
+    os.replace(tmp, path)
+
+def start_exporter(path, fmt: str = "prom", interval: float = 60.0) -> threading.Thread:
+    """interval 초마다 write_metrics 를 실행하는 데몬 스레드를 띄운다 (프로세스당 1회 호출)."""
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                write_metrics(path, fmt)
+            except OSError:
+                pass  # 디스크 문제로 계측이 앱을 멈추게 하지 않는다
+
+    thread = threading.Thread(target=loop, name="metrics-exporter", daemon=True)
+    thread.start()
+    return thread
+
+
+# ========= 세션 프로파일러 =========
+class SessionProfiler:
+    """켜 둔 세션의 전체 실행 1회를 cProfile 로 재고, 누적 시간 상위 함수 보고서를 남긴다."""
+
+    def __init__(self, limit: int = 30):
+        self.limit = limit
+        self.report = ""
+        self.error = None
+        self._prof = None
+
+    def start(self):
+        # 직전 실행이 st.rerun 등으로 중간에 끝났으면 그 측정은 버린다.
+        self.stop(keep=False)
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError as e:  # 다른 프로파일러가 이미 켜져 있음
+            self.error = str(e)
+            return
+        self._prof, self.error = prof, None
+
+    def stop(self, keep: bool = True):
+        prof, self._prof = self._prof, None
+        if prof is None:
+            return
+        prof.disable()
+        if keep:
+            buf = io.StringIO()
+            pstats.Stats(prof, stream=buf).strip_dirs().sort_stats("cumulative").print_stats(self.limit)
+            self.report = buf.getvalue()
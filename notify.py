@@ -0,0 +1,337 @@
+# notify.py
+"""
+새 상담 신청 알림 (웹훅 / 메신저 / 이메일).
+
+상담 신청 처리 중에는 알림 대기열(SQLite)에 한 줄을 넣기만 하고(enqueue, INSERT 1회),
+프로세스당 하나인 백그라운드 워커가 모아서 보낸다. 그래서 사용자는 외부 서비스 응답을 기다리지 않는다.
+
+- 대기열은 파일에 있으므로 재시작해도 남은 알림을 이어서 보낸다.
+- 워커는 보낼 차례가 된 알림을 최대 batch_size 건씩 한 메시지로 묶어 보낸다.
+- 실패하면 30초·1분·2분… 식으로 간격을 두 배씩 늘려(최대 max_delay) 다시 보내고,
+  max_attempts 번 실패한 알림은 실패 보관함(notify_dead)으로 옮긴다 (requeue 로 되살림).
+- 보내는 동안에는 lease 초만큼 다른 워커가 같은 알림을 가져가지 못하게 잡아 둔다.
+
+보내는 곳:
+    WebhookSender : JSON POST {"text": 요약, "leads": [...]} (Slack·Teams 수신 웹훅 등)
+    SmtpSender    : 요약을 본문으로 한 이메일 1통
+
+CLI:
+    python notify.py stub --port 8099 [--fail-first 2]               # 로컬 확인용 웹훅 수신 서버
+    python notify.py drain --db notify.db --webhook http://127.0.0.1:8099/  # 지금 한 번 보내기
+    python notify.py stats --db notify.db
+    python notify.py requeue --db notify.db                          # 실패 보관함 → 대기열
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+import metrics
+from sqlite_tx import transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notify_outbox (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    created    TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    next_at    REAL NOT NULL,
+    last_error TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_notify_outbox_next_at ON notify_outbox(next_at);
+CREATE TABLE IF NOT EXISTS notify_dead (
+    id         INTEGER PRIMARY KEY,
+    created    TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    attempts   INTEGER NOT NULL,
+    last_error TEXT NOT NULL,
+    failed_at  TEXT NOT NULL
+);
+"""
+
+
+def backoff(attempts: int, base: float, cap: float) -> float:
+    """attempts 번째 실패 뒤 다시 보낼 때까지 기다릴 초 (base·2^(attempts-1), 최대 cap)."""
+    return min(cap, base * 2 ** (attempts - 1))
+
+
+# ========= 대기열 =========
+class NotificationQueue:
+    def __init__(self, path, base_delay: float = 30, max_delay: float = 3600, max_attempts: int = 8):
+        self.path = Path(path)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._tx() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_SCHEMA)
+
+    def _tx(self):
+        # 알림 내용에 이름·연락처가 있으므로 파기(purge)한 알림도 빈 페이지에 남지 않게 한다.
+        return transaction(self.path, secure_delete=True)
+
+    def enqueue(self, payload: dict):
+        """알림 1건 추가 (INSERT 1회)."""
+        with self._tx() as con:
+            con.execute(
+                "INSERT INTO notify_outbox(created, payload, next_at) VALUES (?, ?, ?)",
+                (datetime.now().isoformat(timespec="seconds"), json.dumps(payload, ensure_ascii=False), time.time()),
+            )
+
+    def take(self, limit: int, lease: float = 60, now: float | None = None) -> list:
+        """보낼 차례가 된 알림을 최대 limit 건 가져오며 lease 초 동안 잡아 둔다. [(id, payload, attempts)]"""
+        if now is None: now = time.time()
+        with self._tx() as con:
+            rows = con.execute(
+                "UPDATE notify_outbox SET next_at = ? WHERE id IN "
+                "(SELECT id FROM notify_outbox WHERE next_at <= ? ORDER BY id LIMIT ?) "
+                "RETURNING id, payload, attempts",
+                (now + lease, now, int(limit)),
+            ).fetchall()
+        return sorted((i, json.loads(p), a) for i, p, a in rows)
+
+    def ack(self, ids):
+        with self._tx() as con:
+            con.executemany("DELETE FROM notify_outbox WHERE id = ?", [(i,) for i in ids])
+
+    def fail(self, ids, error: str, now: float | None = None) -> int:
+        """보내기 실패: 다음 시도를 미루고, 횟수를 다 쓴 알림은 실패 보관함으로 옮긴다. 옮긴 건수를 돌려준다."""
+        if now is None: now = time.time()
+        dead = 0
+        with self._tx() as con:
+            for i in ids:
+                row = con.execute("SELECT created, payload, attempts FROM notify_outbox WHERE id = ?", (i,)).fetchone()
+                if row is None:
+                    continue
+                created, payload, attempts = row[0], row[1], row[2] + 1
+                if attempts >= self.max_attempts:
+                    con.execute(
+                        "INSERT OR REPLACE INTO notify_dead(id, created, payload, attempts, last_error, failed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (i, created, payload, attempts, error, datetime.now().isoformat(timespec="seconds")),
+                    )
+                    con.execute("DELETE FROM notify_outbox WHERE id = ?", (i,))
+                    dead += 1
+                else:
+                    con.execute(
+                        "UPDATE notify_outbox SET attempts = ?, next_at = ?, last_error = ? WHERE id = ?",
+                        (attempts, now + backoff(attempts, self.base_delay, self.max_delay), error, i),
+                    )
+        return dead
+
+    def retry_now(self) -> int:
+        """재시도를 기다리는 알림을 모두 지금 보낼 차례로 당긴다."""
+        with self._tx() as con:
+            return con.execute("UPDATE notify_outbox SET next_at = ? WHERE next_at > ?", (time.time(),) * 2).rowcount
+
+    def requeue_dead(self) -> int:
+        """실패 보관함의 알림을 횟수를 0 으로 돌려 대기열에 다시 넣는다."""
+        with self._tx() as con:
+            n = con.execute(
+                "INSERT INTO notify_outbox(created, payload, next_at) "
+                "SELECT created, payload, ? FROM notify_dead ORDER BY id", (time.time(),),
+            ).rowcount
+            con.execute("DELETE FROM notify_dead")
+        return n
+
+    def purge(self, before: str) -> int:
+        """created 가 before(YYYY-MM-DD) 이전인 알림을 지운다 (연락처가 들어 있으므로 보관 기간을 따른다)."""
+        with self._tx() as con:
+            n = con.execute("DELETE FROM notify_outbox WHERE created < ?", (before,)).rowcount
+            return n + con.execute("DELETE FROM notify_dead WHERE created < ?", (before,)).rowcount
+
+    def stats(self) -> dict:
+        with self._tx() as con:
+            pending, retrying = con.execute(
+                "SELECT COUNT(*), COALESCE(SUM(attempts > 0), 0) FROM notify_outbox").fetchone()
+            dead = con.execute("SELECT COUNT(*) FROM notify_dead").fetchone()[0]
+            error = con.execute(
+                "SELECT last_error FROM notify_outbox WHERE last_error != '' ORDER BY id DESC LIMIT 1").fetchone()
+        return {"pending": pending, "retrying": retrying, "dead": dead, "last_error": error[0] if error else ""}
+
+
+# ========= 보내는 곳 =========
+def summary_text(leads: list) -> str:
+    lines = [f"📩 새 상담 신청 {len(leads)}건"]
+    for lead in leads:
+        line = f"- {lead.get('name', '')} {lead.get('phone', '')} ({lead.get('applied_on', '')})"
+        if lead.get("after_diagnosis"):
+            line += " · 진단 후 신청"
+        if lead.get("memo"):
+            line += f" · {lead['memo']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class WebhookSender:
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, leads: list):
+        body = json.dumps({"text": summary_text(leads), "leads": leads}, ensure_ascii=False).encode("utf-8")
+        req = urllib.request.Request(self.url, data=body, method="POST",
+                                     headers={"Content-Type": "application/json; charset=utf-8"})
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:  # 4xx/5xx 는 HTTPError
+            resp.read()
+
+
+class SmtpSender:
+    name = "smtp"
+
+    def __init__(self, host: str, port: int, sender: str, to: list, user: str = "", password: str = "",
+                 starttls: bool = False, timeout: float = 10):
+        self.host, self.port = host, port
+        self.sender, self.to = sender, to
+        self.user, self.password = user, password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def send(self, leads: list):
+        import smtplib
+        from email.message import EmailMessage
+
+        msg = EmailMessage()
+        msg["Subject"] = f"[상담 신청] 새 신청 {len(leads)}건"
+        msg["From"] = self.sender
+        msg["To"] = ", ".join(self.to)
+        msg.set_content(summary_text(leads))
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.user:
+                smtp.login(self.user, self.password)
+            smtp.send_message(msg)
+
+
+# ========= 워커 =========
+class NotificationWorker:
+    """대기열을 batch_size 건씩 보내는 데몬 스레드 (프로세스당 1개)."""
+
+    def __init__(self, queue: NotificationQueue, sender, batch_size: int = 20, interval: float = 5,
+                 linger: float = 2, lease: float = 60):
+        self.queue = queue
+        self.sender = sender
+        self.batch_size = batch_size
+        self.interval = interval  # 재시도 차례를 확인하는 주기(초)
+        self.linger = linger      # 새 알림이 들어오면 이만큼 더 모아서 보낸다
+        self.lease = lease
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def wake(self):
+        """새 알림을 넣은 뒤 호출하면 다음 주기를 기다리지 않고 보낸다."""
+        self._wake.set()
+
+    def run_once(self, now: float | None = None) -> int:
+        """보낼 차례가 된 알림 한 묶음을 보낸다. 보낸 건수를 돌려준다."""
+        batch = self.queue.take(self.batch_size, self.lease, now)
+        if not batch:
+            return 0
+        ids = [i for i, _, _ in batch]
+        try:
+            with metrics.timer("notify_send_seconds", channel=self.sender.name):
+                self.sender.send([payload for _, payload, _ in batch])
+        except Exception as e:  # 네트워크·서버 오류는 모두 재시도 대상
+            dead = self.queue.fail(ids, f"{type(e).__name__}: {e}", now)
+            metrics.inc("notify_failures_total", channel=self.sender.name)
+            if dead:
+                metrics.inc("notify_dead_total", dead, channel=self.sender.name)
+            return 0
+        self.queue.ack(ids)
+        metrics.inc("notify_sent_total", len(ids), channel=self.sender.name)
+        return len(ids)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                sent = self.run_once()
+            except sqlite3.Error:
+                sent = 0  # 대기열 파일 문제로 스레드가 죽지 않게 하고 다음 주기에 다시 시도한다
+            if sent == self.batch_size:
+                continue  # 밀린 알림이 더 있을 수 있다
+            if self._wake.wait(self.interval):
+                self._wake.clear()
+                self._stop.wait(self.linger)
+
+    def start(self) -> threading.Thread:
+        self._thread = threading.Thread(target=self._loop, name="lead-notifier", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+# ========= 로컬 확인용 웹훅 수신 서버 =========
+def serve_stub(port: int, fail_first: int = 0):
+    """받은 본문을 출력하는 웹훅 서버. 처음 fail_first 번은 503 으로 답해 재시도를 확인할 수 있다."""
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    state = {"seen": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            state["seen"] += 1
+            if state["seen"] <= fail_first:
+                self.send_response(503)
+                self.end_headers()
+                print(f"[{state['seen']}] 503 (일부러 실패)", flush=True)
+                return
+            self.send_response(200)
+            self.end_headers()
+            print(f"[{state['seen']}] {json.loads(body)['text']}", flush=True)
+
+        def log_message(self, *args):
+            pass
+
+    print(f"웹훅 수신 대기: http://127.0.0.1:{port}/", flush=True)
+    HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="상담 신청 알림 도구")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("stub", help="로컬 확인용 웹훅 수신 서버")
+    s.add_argument("--port", type=int, default=8099)
+    s.add_argument("--fail-first", type=int, default=0, help="처음 N 번은 503 으로 응답")
+    d = sub.add_parser("drain", help="대기열을 지금 보내기 (재시도 대기 중인 것 포함)")
+    d.add_argument("--db", default="notify.db")
+    d.add_argument("--webhook", required=True)
+    for name, help_text in (("stats", "대기열 현황"), ("requeue", "실패 보관함 → 대기열")):
+        sub.add_parser(name, help=help_text).add_argument("--db", default="notify.db")
+    args = p.parse_args(argv)
+
+    if args.cmd == "stub":
+        serve_stub(args.port, args.fail_first)
+        return 0
+    queue = NotificationQueue(args.db)
+    if args.cmd == "drain":
+        worker = NotificationWorker(queue, WebhookSender(args.webhook))
+        queue.retry_now()
+        sent = 0
+        while n := worker.run_once():
+            sent += n
+        print(f"{sent:,}건 전송 · {queue.stats()}")
+    elif args.cmd == "stats":
+        print(queue.stats())
+    elif args.cmd == "requeue":
+        print(f"{queue.requeue_dead():,}건 다시 대기열로")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
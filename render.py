@@ -0,0 +1,167 @@
+# render.py
+"""
+화면 HTML 조립.
+
+- 스타일·사이드바·헤더·안내 박스처럼 바뀌지 않는 조각은 프로세스당 한 번만 만든다 (lru_cache).
+- 진단 결과(입력 요약 + 자금 카드 + What-if + 안내)는 미리 만들어 둔 템플릿으로 HTML 한 덩어리를
+  만들어 st.markdown 한 번(델타 1개)으로 보낸다.
+- PayloadMeter 는 세션이 브라우저로 보내는 메시지 바이트 수를 실행(전체/프래그먼트) 단위로 센다.
+
+Markdown 안의 HTML 블록은 빈 줄에서 끝나므로, 템플릿은 빈 줄·들여쓰기 없이 한 줄로 이어 붙인다.
+"""
+import functools
+import html
+from collections import deque
+from string import Template
+
+# ========= 정적 조각 =========
+STYLE_CSS = """
+.block-container {padding-top: 1.25rem; padding-bottom: 2rem;}
+.card { border: 1px solid #e6e6e6; border-radius: 12px; padding: 16px 18px; margin-bottom: 14px; background: #fff; }
+.result-card{ border:1px solid #E5EAF2; border-radius:14px; padding:14px 16px; margin:10px 0; background:#F9FBFF; }
+.badge {display:inline-block; padding:2px 8px; border-radius:999px; font-size:12px; font-weight:600; margin-left:6px;
+  background:#EEF2FF; color:#334155; border:1px solid #E5E7EB;}
+.small {font-size: 13px; color:#6b7280;}
+hr.soft {border:none; border-top:1px dashed #e5e7eb; margin:10px 0;}
+.sidebar-links a {display:block; margin:6px 0;}
+.summary-grid {display:grid; grid-template-columns:repeat(3, 1fr); gap:4px 18px;}
+.summary-grid ul {margin:0; padding-left:18px;}
+@media (max-width: 640px) { .summary-grid {grid-template-columns:1fr;} }
+.result-head {display:flex; justify-content:space-between; align-items:center;}
+.result-name {font-size:16px; font-weight:800;}
+.info-box {background:#eef6ff; color:#1e3a5f; border-radius:8px; padding:12px 16px; margin:10px 0;}
+.notice {border-left:6px solid #1f6feb; background:#eaf2ff; padding:14px 16px; border-radius:8px; margin:12px 0 4px 0;}
+details.whatif {margin:10px 0;} details.whatif summary {cursor:pointer; font-weight:600;}
+"""
+
+NOTICE_HTML = (
+    '<div class="notice"><b>안내</b><br/>'
+    "💡 정책자금 승인 여부와 조건은 신용 점수나 매출뿐 아니라 <b>사업계획서·기술력·대표자 상황</b> 등에 따라 달라질 수 있습니다. "
+    "또한 <b>복수 자금 활용</b>, <b>시차를 둔 추가 신청</b> 등 운용 방식에 따라 결과가 달라질 수 있습니다.<br/><br/>"
+    "※ 본 자료는 참고용이며, 실제 심사는 기관 정책 및 신청인 신용 상태에 따라 달라질 수 있습니다."
+    "</div>"
+)
+
+
+def _minify_css(css: str) -> str:
+    return " ".join(css.split())
+
+
+@functools.lru_cache(maxsize=None)
+def header_markdown(brand: str, phone: str, blog_url: str, kakao_link: str) -> str:
+    """<style> + 상단 헤더 (델타 1개)."""
+    return (
+        f"<style>{_minify_css(STYLE_CSS)}</style>\n\n"
+        f"## 📊 {brand} – 정책자금 맞춤 도우미\n"
+        '<p class="small">정부 정책자금 진단 및 상담 연계 서비스</p>\n\n'
+        f"📞 대표번호: **{phone}**  ·  🔗 블로그: [바로가기]({blog_url})  ·  💬 카카오채널: [연결하기]({kakao_link})\n\n"
+        "---"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def sidebar_markdown(brand: str, phone: str, blog_url: str, kakao_link: str) -> str:
+    """사이드바 전체 (델타 1개)."""
+    return (
+        "### 🧭 사용 방법\n"
+        "- ① 기본정보 입력 → ② 추가 체크 → ③ 제출\n"
+        "- 결과 하단 안내문구와 상담 신청을 확인하세요.\n\n"
+        "---\n"
+        "### ☎ 상담/문의\n"
+        f"- 대표번호: **{phone}**\n"
+        f"- 블로그: [{brand}  블로그]({blog_url})\n"
+        f"- 카카오채널: [바로 연결하기]({kakao_link})\n\n"
+        '<p class="small">👉 상담은 무료이며, 실제 신청은 고객님 명의로만 진행됩니다.</p>'
+    )
+
+
+# ========= 결과 템플릿 =========
+_SUMMARY = Template('<div class="card"><h4>🧾 입력 요약</h4><div class="summary-grid">$columns</div></div>')
+_SUMMARY_ITEM = Template("<li>$label: <b>$value</b></li>")
+_CARD = Template(
+    '<div class="result-card">'
+    '<div class="result-head"><div class="result-name">$name</div><span class="badge">분석</span></div>'
+    "<div class='small'>예상 한도: <b>$range</b></div>"
+    "<div class='small'>예상 금리: <b>$rate</b></div>"
+    '<hr class="soft" />'
+    "<div class='small'>$notes</div>"
+    "<div style='margin-top:6px;'>👉 <a href=\"$link\" target=\"_blank\">신청 안내 바로가기</a></div>"
+    "</div>"
+)
+_NO_MATCH = Template('<div class="info-box">현재 조건에 맞는 자금을 찾지 못했습니다.$reasons</div>')
+_WHATIF = Template(
+    '<details class="whatif"><summary>🔍 조건이 바뀌면? (What-if)</summary><ul>$items</ul>'
+    '<p class="small">다른 입력은 그대로 두고 해당 조건만 바뀌었을 때의 참고 결과입니다.</p></details>'
+)
+_WHATIF_ITEM = Template("<li><b>$fund</b>: $text</li>")
+_VERSION = Template('<p class="small">판정 기준: 정책 카탈로그 $version</p>')
+
+_CARD_FIELDS = ("name", "range", "rate", "notes", "link")
+
+
+def _esc(value) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def summary_html(columns: list) -> str:
+    """columns: [[(라벨, 값), ...], ...] → 3단 입력 요약 카드."""
+    cols = "".join(
+        "<ul>" + "".join(_SUMMARY_ITEM.substitute(label=_esc(k), value=_esc(v)) for k, v in col) + "</ul>"
+        for col in columns
+    )
+    return _SUMMARY.substitute(columns=cols)
+
+
+def results_html(summary: list, results: list, reasons: list, hints: list, catalog_version: str) -> str:
+    """입력 요약 ~ 안내 박스까지 결과 영역 전체를 HTML 한 덩어리로."""
+    parts = [summary_html(summary), "<h3>🔎 분석 결과</h3>"]
+    if results:
+        parts += [_CARD.substitute({k: _esc(r.get(k, "")) for k in _CARD_FIELDS}) for r in results]
+    else:
+        parts.append(_NO_MATCH.substitute(reasons=_esc(f" ({' · '.join(reasons)})") if reasons else ""))
+    if hints:
+        items = "".join(_WHATIF_ITEM.substitute(fund=_esc(h["fund"]), text=_esc(h["text"])) for h in hints)
+        parts.append(_WHATIF.substitute(items=items))
+    parts.append(_VERSION.substitute(version=_esc(catalog_version)))
+    parts.append(NOTICE_HTML)
+    return "".join(parts)
+
+
+# ========= 전송량 측정 =========
+class PayloadMeter:
+    """
+    세션이 보내는 ForwardMsg 바이트 수(protobuf 직렬화 크기)를 실행 단위로 센다.
+    ScriptRunContext 의 내부 전송 함수(_enqueue)를 감싸므로, Streamlit 내부 구조가 달라져
+    감쌀 수 없으면 조용히 측정을 건너뛴다.
+    """
+
+    def __init__(self, keep: int = 20):
+        self.runs = deque(maxlen=keep)  # 끝난 실행: {"run", "bytes", "msgs"}
+        self.current = None
+
+    def start(self, label: str, ctx):
+        """새 실행 시작. 직전 실행 기록을 닫고, ctx 전송 함수에 계측을 건다."""
+        if self.current is not None:
+            self.runs.append(self.current)
+        self.current = {"run": label, "bytes": 0, "msgs": 0}
+        send = getattr(ctx, "_enqueue", None)
+        if send is None or getattr(send, "meter", None) is self:
+            return
+        send = getattr(send, "inner", send)  # 이전 계측기(세션 상태 초기화 등)는 벗겨낸다
+
+        def metered(msg):
+            cur = self.current
+            if cur is not None:
+                cur["bytes"] += msg.ByteSize()
+                cur["msgs"] += 1
+            send(msg)
+
+        metered.meter, metered.inner = self, send
+        ctx._enqueue = metered
+
+    def last(self, label: str | None = None):
+        """가장 최근에 끝난 실행 기록 (label 을 주면 그 종류 중에서)."""
+        for run in reversed(self.runs):
+            if label is None or run["run"] == label:
+                return run
+        return None
@@ -0,0 +1,60 @@
+# result_cache.py
+"""
+진단 결과 공유 캐시 (프로세스 공용, 모든 세션이 함께 쓴다).
+
+기본값 그대로이거나 거의 같은 입력으로 제출하는 방문자가 많으므로, 같은 날 같은(정규화된) 입력이면
+자금 판정·What-if·결과 HTML 을 다시 만들지 않고 돌려준다.
+
+    cache = DailyLRU(1024)
+    (results, html), hit = cache.get_or_compute(key, compute)
+
+나이·업력 계산이 오늘 날짜에 달려 있으므로 판정일을 키에 넣고, 날짜가 바뀌면 전날 항목을 한꺼번에 버린다.
+돌려준 값은 여러 세션이 함께 보므로 호출 측에서 수정하지 않는다.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import metrics
+
+
+class DailyLRU:
+    def __init__(self, maxsize: int = 1024, name: str = "results"):
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # (판정일, 키) → 값 (오래 안 쓴 순)
+        self._day = None
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute, today: date | None = None):
+        """(값, 적중 여부). compute() 는 잠금 밖에서 실행한다 (동시에 들어온 같은 키는 두 번 계산될 수 있다)."""
+        if today is None: today = date.today()
+        key = (today, key)
+        with self._lock:
+            if today != self._day:  # 자정이 지났으면 전날 항목은 모두 만료
+                self._data.clear()
+                self._day = today
+            value = self._data.get(key, self._data)
+            hit = value is not self._data
+            if hit:
+                self._data.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.inc("result_cache_total", cache=self.name, result="hit" if hit else "miss")
+        if hit:
+            return value, True
+
+        value = compute()
+        with self._lock:
+            if today == self._day:  # 계산하는 사이 날짜가 바뀌었으면 넣지 않는다
+                self._data[key] = value
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value, False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,25 @@
+# sqlite_tx.py
+"""
+SQLite 짧은 연결 + 트랜잭션 (contact_store · lead_stats · notify 공용).
+
+    with transaction(path) as con:
+        con.execute(...)   # 블록이 끝나면 commit, 예외면 rollback, 연결은 항상 닫는다
+
+호출마다 짧게 연결한다(세션 스레드 간 공유 X). 파일은 WAL 이라 읽기와 쓰기가 서로 막지 않는다.
+secure_delete=True 면 지운 행이 빈 페이지에 남지 않도록 0 으로 덮어쓴다 (이름·연락처가 든 파일용).
+"""
+import sqlite3
+from contextlib import contextmanager
+
+
+@contextmanager
+def transaction(path, secure_delete: bool = False):
+    con = sqlite3.connect(path, timeout=10)
+    try:
+        con.execute("PRAGMA synchronous=NORMAL")
+        if secure_delete:
+            con.execute("PRAGMA secure_delete=ON")
+        with con:
+            yield con
+    finally:
+        con.close()
@@ -0,0 +1,136 @@
+# tests/test_contact_store.py
+"""contact_store.py: CSV 캐시·검색."""
+import sqlite3
+import threading
+
+import pytest
+
+from contact_store import (
+    CsvContactStore, PartitionedContactStore, SqliteContactStore, migrate_csv_to_sqlite, migrate_to_partitions, open_store,
+)
+
+
+def _file_ids(path) -> list:
+    return [line.split(",")[0] for line in path.read_text(encoding="utf-8").splitlines()[1:]]
+
+
+# ========= CSV 캐시 =========
+def test_csv_cache_matches_file_under_concurrent_appends(tmp_path):
+    """세션 스레드가 덧붙이는 동안 다른 스레드가 읽어도 행이 두 번 캐시되지 않는다 (compact 후에도)."""
+    path = tmp_path / "contacts.csv"
+    store = CsvContactStore(path)
+    store.append("시작", "010-0000-0000", "")
+    stop = threading.Event()
+
+    def write(k):
+        for i in range(200):
+            store.append(f"w{k}", f"010-{k:04d}-{i:04d}", "메모")
+
+    def read():
+        while not stop.is_set():
+            store.load_df()
+            store.count()
+
+    writers = [threading.Thread(target=write, args=(k,)) for k in range(6)]
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for t in readers + writers:
+        t.start()
+    for t in writers:
+        t.join()
+    stop.set()
+    for t in readers:
+        t.join()
+
+    df = store.load_df()
+    assert len(df) == store.count() == len(_file_ids(path)) == 1 + 6 * 200
+    assert not df.index.duplicated().any()
+
+    store.delete([df.index[0]])
+    store.compact()
+    ids = _file_ids(path)
+    assert len(ids) == len(set(ids)) == 6 * 200
+
+
+def test_csv_partial_last_line_waits_for_newline(tmp_path):
+    path = tmp_path / "contacts.csv"
+    store = CsvContactStore(path)
+    store.append("홍길동", "010-1234-5678", "")
+    assert len(store.load_df()) == 1
+    with path.open("a", encoding="utf-8", newline="") as f:
+        f.write("abcd1234abcd1234,김철")  # 쓰는 중인 줄
+        f.flush()
+        assert list(store.load_df()["이름"]) == ["홍길동"]
+        f.write("수,010-1111-2222,,2026-10-18\r\n")
+    assert list(store.load_df()["이름"]) == ["홍길동", "김철수"]
+
+
+def test_legacy_cp949_csv_is_upgraded_once_then_read_as_utf8(tmp_path):
+    path = tmp_path / "contacts.csv"
+    path.write_bytes("이름,연락처,메모,신청일\r\n홍길동,01033334444,메모,2026-10-01\r\n".encode("cp949"))
+    store = CsvContactStore(path)
+    assert store.count() == 1
+    store.append("김철수", "010-1111-2222", "")
+    assert list(store.load_df()["연락처"]) == ["010-3333-4444", "010-1111-2222"]
+    assert [len(c) for c in store.iter_chunks()] == [2]
+    assert path.read_text(encoding="utf-8").splitlines()[0] == "ID,이름,연락처,메모,신청일"
+
+
+# ========= 검색 =========
+@pytest.fixture(params=["sqlite", "csv", "partitioned"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SqliteContactStore(tmp_path / "contacts.db")
+    if request.param == "csv":
+        return CsvContactStore(tmp_path / "contacts.csv")
+    return PartitionedContactStore(tmp_path / "contacts")
+
+
+@pytest.mark.parametrize("query", ["010-1111", "1111", "1111-2222", "0101111", "+82 10-1111"])
+def test_phone_search_matches_prefix_middle_and_suffix(store, query):
+    store.append_many([("김철수", "01011112222", "", "2026-10-02"), ("홍길동", "010-3333-4444", "", "2026-10-01")])
+    assert list(store.search(query)["연락처"]) == ["010-1111-2222"]
+
+
+def test_name_search_and_no_false_phone_hits(store):
+    store.append_many([("김철수", "01011112222", "", "2026-10-02"), ("홍길동", "010-3333-4444", "", "2026-10-01")])
+    assert list(store.search("길동")["이름"]) == ["홍길동"]
+    assert store.search("2223").empty
+
+
+def test_sqlite_v1_database_rebuilds_phone_grams(tmp_path):
+    path = tmp_path / "contacts.db"
+    SqliteContactStore(path).append("김철수", "010-1111-2222", "")
+    con = sqlite3.connect(path)
+    with con:  # 뒷 4자리만 색인하던 예전(v1) 상태로 되돌린다
+        con.execute("DELETE FROM contact_grams WHERE gram LIKE '#%' AND gram != '#2222'")
+        con.execute("PRAGMA user_version = 1")
+    con.close()
+    assert list(SqliteContactStore(path).search("010-1111")["이름"]) == ["김철수"]
+
+
+# ========= 이전(migration) =========
+def _legacy_csv(tmp_path):
+    csv_path = tmp_path / "contacts.csv"
+    source = CsvContactStore(csv_path)
+    source.append_many([("김철수", "010-1111-2222", "", "2026-10-02"), ("홍길동", "010-3333-4444", "", "2026-10-01")])
+    source.delete([source.load_df().index[0]])
+    return csv_path
+
+
+def test_migrations_leave_no_plaintext_copy(tmp_path):
+    csv_path = _legacy_csv(tmp_path)
+    assert migrate_csv_to_sqlite(csv_path, tmp_path / "contacts.db") == 1
+    assert [p.name for p in tmp_path.iterdir() if "csv" in p.name] == []
+
+    csv_path = _legacy_csv(tmp_path)
+    assert migrate_to_partitions(tmp_path / "contacts", "sqlite", csv_path, tmp_path / "contacts.db") == 2
+    assert [p.name for p in tmp_path.iterdir() if "csv" in p.name] == []
+    assert SqliteContactStore(tmp_path / "contacts.db").count() == 0
+
+
+def test_open_store_removes_old_migrated_copies(tmp_path):
+    csv_path = tmp_path / "contacts.csv"
+    (tmp_path / "contacts.csv.migrated").write_text("ID,이름,연락처,메모,신청일\r\n", encoding="utf-8")
+    (tmp_path / "contacts.csv.deleted.migrated").write_text("x\r\n", encoding="utf-8")
+    open_store("sqlite", csv_path, tmp_path / "contacts.db")
+    assert [p.name for p in tmp_path.iterdir() if "csv" in p.name] == []
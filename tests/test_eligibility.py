@@ -0,0 +1,49 @@
+# tests/test_eligibility.py
+"""eligibility.py: 배치 판정·카탈로그 조건식."""
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from eligibility import (
+    CATALOG_PATH, REASON_BAD_DATE, REASON_BAD_NUMBER, compile_rule, evaluate_batch, load_catalog, rejection_reasons,
+)
+
+REF = date(2026, 10, 18)
+GOOD = {"birth": "1980-01-01", "biz_start": "2020-01-01", "sales": 100_000_000,
+        "credit_nice": 800, "credit_kcb": 800, "employees": 2, "biz_sector": "소매업"}
+
+
+def test_bad_inputs_match_nothing_and_say_why():
+    rows = pd.DataFrame([
+        GOOD,
+        dict(GOOD, birth="bad"),
+        dict(GOOD, sales="", employees=""),
+        dict(GOOD, credit_kcb="abc"),
+    ])
+    out = evaluate_batch(rows, REF)
+    assert out["matched"].tolist()[0] > 0
+    assert out["matched"].tolist()[1:] == [0, 0, 0]
+    assert not out["gate"].iloc[1:].any()
+    assert out["reasons"].tolist() == ["", REASON_BAD_DATE, REASON_BAD_NUMBER, REASON_BAD_NUMBER]
+
+
+# ========= 카탈로그 =========
+def test_bool_ops_reject_numeric_operands():
+    with pytest.raises(ValueError):
+        compile_rule("sales and flag_export", {})
+    with pytest.raises(ValueError):
+        compile_rule("sales", {})
+    compile_rule("sales > 0 and flag_export", {})
+
+
+def test_reasons_follow_edited_thresholds_and_caps():
+    raw = CATALOG_PATH.read_text(encoding="utf-8")
+    raw = raw.replace('"제조업" = 10', '"제조업" = 8').replace("min_sales = 10_000_000", "min_sales = 20_000_000")
+    catalog = load_catalog(raw.encode("utf-8"))
+    app = {"birth": date(1980, 1, 1), "biz_start": date(2020, 1, 1), "sales": 15_000_000,
+           "credit_nice": 800, "credit_kcb": 800, "employees": 8, "biz_sector": "제조업"}
+    reasons = rejection_reasons(app, REF, catalog)
+    assert reasons[0] == "연 매출 2,000만원 미만"
+    assert reasons[1].startswith("4대보험 직원 수가 업종별 상한 이상") and "제조업 8인" in reasons[1]
+    assert rejection_reasons(dict(app, employees=7, sales=30_000_000), REF, catalog) == []
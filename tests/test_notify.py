@@ -0,0 +1,217 @@
+# tests/test_notify.py
+"""notify.py: 로컬 웹훅(HTTP)·SMTP 스텁 서버를 띄워 대기열·워커 동작을 확인한다."""
+import email
+import email.policy
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from notify import NotificationQueue, NotificationWorker, SmtpSender, WebhookSender
+
+
+# ========= 스텁 서버 =========
+class WebhookStub(ThreadingHTTPServer):
+    """statuses 의 응답 코드를 차례로 돌려주고(다 쓰면 200) 받은 본문을 모은다."""
+    daemon_threads = True
+
+    def __init__(self, statuses=()):
+        super().__init__(("127.0.0.1", 0), _WebhookHandler)
+        self.statuses = list(statuses)
+        self.bodies = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        if status == 200:
+            self.server.bodies.append(body)
+        self.send_response(status)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class SmtpStub(socketserver.ThreadingTCPServer):
+    """최소한의 SMTP 서버. 처음 fail_first 번의 MAIL 은 451 로 거절하고, 받은 메일을 모은다."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, fail_first: int = 0):
+        super().__init__(("127.0.0.1", 0), _SmtpHandler)
+        self.fail_first = fail_first
+        self.messages = []
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self.reply("220 stub")
+        for raw in self.rfile:
+            verb = raw[:4].decode("ascii", "replace").upper()
+            if verb == "MAIL" and self.server.fail_first > 0:
+                self.server.fail_first -= 1
+                self.reply("451 try again later")
+            elif verb == "DATA":
+                self.reply("354 end with <CRLF>.<CRLF>")
+                lines = []
+                for line in self.rfile:
+                    if line.rstrip(b"\r\n") == b".":
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                self.server.messages.append(email.message_from_bytes(b"".join(lines), policy=email.policy.default))
+                self.reply("250 queued")
+            elif verb == "QUIT":
+                self.reply("221 bye")
+                return
+            else:  # EHLO/HELO, MAIL, RCPT, RSET, NOOP
+                self.reply("250 OK")
+
+
+def _serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def webhook():
+    servers = []
+
+    def start(statuses=()):
+        servers.append(_serve(WebhookStub(statuses)))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def smtp():
+    servers = []
+
+    def start(fail_first=0):
+        servers.append(_serve(SmtpStub(fail_first)))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def lead(i: int) -> dict:
+    return {"name": f"고객{i}", "phone": f"010-0000-{i:04d}", "memo": "", "applied_on": "2026-10-18"}
+
+
+# ========= 웹훅 =========
+def test_batches_up_to_batch_size(tmp_path, webhook):
+    stub = webhook()
+    queue = NotificationQueue(tmp_path / "notify.db")
+    for i in range(5):
+        queue.enqueue(lead(i))
+    worker = NotificationWorker(queue, WebhookSender(stub.url, timeout=5), batch_size=2)
+
+    assert [worker.run_once() for _ in range(4)] == [2, 2, 1, 0]
+    assert [[x["name"] for x in body["leads"]] for body in stub.bodies] == [
+        ["고객0", "고객1"], ["고객2", "고객3"], ["고객4"],
+    ]
+    assert stub.bodies[0]["text"].startswith("📩 새 상담 신청 2건")
+    assert queue.stats()["pending"] == 0
+
+
+def test_backs_off_after_503(tmp_path, webhook):
+    stub = webhook([503, 503])
+    queue = NotificationQueue(tmp_path / "notify.db", base_delay=30, max_delay=3600)
+    queue.enqueue(lead(1))
+    worker = NotificationWorker(queue, WebhookSender(stub.url, timeout=5))
+    t0 = time.time()
+
+    assert worker.run_once(now=t0) == 0  # 1번째 실패 → 30초 뒤
+    stats = queue.stats()
+    assert (stats["pending"], stats["retrying"]) == (1, 1)
+    assert "503" in stats["last_error"]
+    assert worker.run_once(now=t0 + 29) == 0 and stub.statuses == [503]  # 아직 보낼 차례가 아니다
+
+    assert worker.run_once(now=t0 + 30) == 0  # 2번째 실패 → 60초 뒤
+    assert worker.run_once(now=t0 + 89) == 0 and stub.bodies == []
+    assert worker.run_once(now=t0 + 90) == 1
+    assert [x["name"] for x in stub.bodies[0]["leads"]] == ["고객1"]
+    assert queue.stats()["pending"] == 0
+
+
+def test_dead_letter_after_max_attempts_and_requeue(tmp_path, webhook):
+    stub = webhook([503] * 3)
+    queue = NotificationQueue(tmp_path / "notify.db", base_delay=1, max_delay=1, max_attempts=3)
+    queue.enqueue(lead(7))
+    worker = NotificationWorker(queue, WebhookSender(stub.url, timeout=5))
+    now = time.time()
+
+    for attempt in range(3):
+        assert worker.run_once(now=now + 10 * attempt) == 0
+    stats = queue.stats()
+    assert (stats["pending"], stats["dead"]) == (0, 1)
+    assert worker.run_once(now=now + 100) == 0 and stub.statuses == []  # 실패 보관함은 보내지 않는다
+
+    assert queue.requeue_dead() == 1
+    stats = queue.stats()
+    assert (stats["pending"], stats["retrying"], stats["dead"]) == (1, 0, 0)
+    assert worker.run_once() == 1
+    assert stub.bodies[0]["leads"] == [lead(7)]
+
+
+def test_queue_survives_reopen(tmp_path, webhook):
+    stub = webhook()
+    path = tmp_path / "notify.db"
+    first = NotificationQueue(path)
+    for i in range(3):
+        first.enqueue(lead(i))
+    t0 = time.time()
+    taken = first.take(2, lease=60, now=t0)  # 보내는 도중 프로세스가 죽은 상황 (ack 없음)
+    assert len(taken) == 2
+
+    reopened = NotificationQueue(path)
+    assert reopened.stats()["pending"] == 3
+    worker = NotificationWorker(reopened, WebhookSender(stub.url, timeout=5))
+    assert worker.run_once(now=t0) == 1  # 잡혀 있지 않은 1건만
+    assert worker.run_once(now=t0 + 60) == 2  # lease 가 끝나면 나머지도 보낸다
+    assert sorted(x["name"] for body in stub.bodies for x in body["leads"]) == ["고객0", "고객1", "고객2"]
+    assert NotificationQueue(path).stats()["pending"] == 0
+
+
+# ========= SMTP =========
+def test_smtp_sends_one_mail_per_batch_and_retries(tmp_path, smtp):
+    stub = smtp(fail_first=1)
+    queue = NotificationQueue(tmp_path / "notify.db", base_delay=30)
+    queue.enqueue(lead(1))
+    queue.enqueue(dict(lead(2), memo="오후 연락 희망"))
+    sender = SmtpSender("127.0.0.1", stub.port, "app@example.com", ["ops@example.com"], timeout=5)
+    worker = NotificationWorker(queue, sender)
+    t0 = time.time()
+
+    assert worker.run_once(now=t0) == 0
+    assert "451" in queue.stats()["last_error"]
+    assert worker.run_once(now=t0 + 30) == 2
+
+    assert len(stub.messages) == 1
+    msg = stub.messages[0]
+    assert msg["Subject"] == "[상담 신청] 새 신청 2건"
+    assert msg["To"] == "ops@example.com"
+    body = msg.get_content()
+    assert "고객1 010-0000-0001" in body and "오후 연락 희망" in body
@@ -0,0 +1,180 @@
+# whatif.py
+"""
+조건 변경 시뮬레이션 (What-if).
+
+신청인 1명의 입력값을 기준으로 NICE/KCB 점수, 연 매출, 직원 수, 판정 시점(개월 후)을
+격자로 바꾼 변형 수만 개를 만들어 PolicyCatalog.fund_masks 로 한 번에(벡터 연산) 판정하고,
+아직 해당하지 않는 자금마다 "가장 가까운" 변경 조건을 찾는다.
+
+    hints = simulate(applicant)
+    # [{"fund": "일반경영안정자금", "text": "NICE 665점 이상",
+    #   "changes": [{"lever": "credit_nice", "value": 665, "text": "NICE 665점 이상"}]}, ...]
+"""
+import calendar
+from datetime import date
+
+import numpy as np
+
+from eligibility import PolicyCatalog, applicant_values, current_catalog, months_between, years_between
+
+# 한 축씩 바꿔 보는 격자 (기준값·경계값이 모두 들어가도록 1 단위)
+SCORE_GRID = np.arange(0, 1001)
+SALES_GRID = np.arange(0, 300_000_001, 1_000_000)
+EMPLOYEE_GRID = np.arange(0, 31)
+MONTH_GRID = np.arange(1, 37)  # 1~36개월 후
+# 점수 두 개를 함께 바꾸는 2차원 격자 (5점 단위)
+PAIR_GRID = np.arange(0, 1001, 5)
+
+LEVER_LABELS = {
+    "credit_nice": "NICE",
+    "credit_kcb": "KCB",
+    "sales": "연 매출",
+    "employees": "4대보험 직원",
+    "months": "판정 시점",
+    "credit_pair": "NICE·KCB",
+}
+
+
+def add_months(d: date, months: int) -> date:
+    y, m = divmod(d.month - 1 + months, 12)
+    y, m = d.year + y, m + 1
+    return date(y, m, min(d.day, calendar.monthrange(y, m)[1]))
+
+
+def _variants(base: dict, app: dict, ref: date):
+    """기준값 base 에서 한 축씩(또는 점수 쌍) 바꾼 변형들을 열 단위 배열로 만든다.
+    반환: (값 배열 dict, [(lever, 구간 slice, 축 값 배열)])"""
+    nice_pair, kcb_pair = (g.ravel() for g in np.meshgrid(PAIR_GRID, PAIR_GRID, indexing="ij"))
+    later = [add_months(ref, int(k)) for k in MONTH_GRID]
+    axes = [
+        ("credit_nice", SCORE_GRID, {"credit_nice": SCORE_GRID}),
+        ("credit_kcb", SCORE_GRID, {"credit_kcb": SCORE_GRID}),
+        ("sales", SALES_GRID, {"sales": SALES_GRID}),
+        ("employees", EMPLOYEE_GRID, {"employees": EMPLOYEE_GRID}),
+        ("months", MONTH_GRID, {
+            "age": np.array([int(years_between(app["birth"], d)) for d in later]),
+            "biz_months": np.array([months_between(app["biz_start"], d) for d in later]),
+        }),
+        ("credit_pair", np.stack([nice_pair, kcb_pair], axis=1), {"credit_nice": nice_pair, "credit_kcb": kcb_pair}),
+    ]
+    total = sum(len(values) for _, values, _ in axes)
+    v = {k: np.full(total, val) for k, val in base.items()}
+    segments, pos = [], 0
+    for lever, values, cols in axes:
+        n = len(values)
+        for k, arr in cols.items():
+            v[k][pos:pos + n] = arr
+        segments.append((lever, slice(pos, pos + n), values))
+        pos += n
+    return v, segments
+
+
+def _nearest(ok: np.ndarray, lever: str, values, base: dict, shift: int, ok_fn):
+    """구간에서 조건을 만족하는 값 중 현재값과 가장 가까운 것 (개월 수는 가장 이른 것)."""
+    cand = values[ok]
+    if lever == "months":
+        return int(cand[0]) + shift
+    if lever != "credit_pair":
+        return int(cand[int(np.argmin(np.abs(cand - base[lever])))])
+    dist = np.abs(cand[:, 0] - base["credit_nice"]) + np.abs(cand[:, 1] - base["credit_kcb"])
+    best = cand[int(np.argmin(dist))]
+    # 5점 격자에서 찾은 값 주변을 1점 단위로 다시 확인한다.
+    n, k = (g.ravel() for g in np.meshgrid(np.arange(best[0] - 4, best[0] + 5), np.arange(best[1] - 4, best[1] + 5), indexing="ij"))
+    v = {key: np.full(n.size, val) for key, val in base.items()}
+    v.update(credit_nice=n, credit_kcb=k)
+    fine = np.stack([n, k], axis=1)[ok_fn(v)]
+    dist = np.abs(fine[:, 0] - base["credit_nice"]) + np.abs(fine[:, 1] - base["credit_kcb"])
+    return tuple(int(x) for x in fine[int(np.argmin(dist))])
+
+
+def _apply(values: dict, app: dict, ref: date, lever: str, value) -> dict:
+    values = dict(values)
+    if lever == "months":
+        later = add_months(ref, value)
+        values.update(age=int(years_between(app["birth"], later)), biz_months=months_between(app["biz_start"], later))
+    elif lever == "credit_pair":
+        values.update(credit_nice=value[0], credit_kcb=value[1])
+    else:
+        values[lever] = value
+    return values
+
+
+def _describe(base: dict, final: dict, months: int) -> list:
+    """기준값 → 최종값 차이를 사람이 읽는 변경 조건 목록으로."""
+    changes = []
+    if months:
+        changes.append({"lever": "months", "value": months, "text": f"{months}개월 후"})
+    for lever, unit in (("sales", "원"), ("employees", "명")):
+        if final[lever] != base[lever]:
+            word = "이상" if final[lever] > base[lever] else "이하"
+            changes.append({"lever": lever, "value": final[lever],
+                            "text": f"{LEVER_LABELS[lever]} {final[lever]:,}{unit} {word}"})
+    credit = [(lever, final[lever], base[lever]) for lever in ("credit_nice", "credit_kcb") if final[lever] != base[lever]]
+    if len(credit) == 2:
+        value = (final["credit_nice"], final["credit_kcb"])
+        changes.append({"lever": "credit_pair", "value": value, "text": f"NICE {value[0]}점 · KCB {value[1]}점"})
+    elif credit:
+        lever, new, old = credit[0]
+        changes.append({"lever": lever, "value": new,
+                        "text": f"{LEVER_LABELS[lever]} {new}점 {'이상' if new > old else '이하'}"})
+    return changes
+
+
+def simulate(app: dict, ref: date | None = None, catalog: PolicyCatalog | None = None) -> list:
+    """
+    해당하지 않는 자금별로 가장 가까운 변경 조건을 돌려준다.
+
+    1) 최소 게이트(매출·신용·업력·직원 수)에서 떨어진 사유가 있으면, 사유마다 그 사유만
+       해소되는 가장 가까운 값을 찾아 기준값에 반영한다.
+    2) 반영한 기준값에서 자금별로 한 축만 바꿔 되는 조건을 찾고, 없으면 NICE·KCB 를
+       함께 바꾸는 조건을 찾는다.
+    반환: [{"fund", "changes": [{"lever", "value", "text"}], "text", "catalog_version"}]
+    """
+    if ref is None: ref = date.today()
+    if catalog is None: catalog = current_catalog()
+    fund_masks, reason_masks = catalog.fund_masks, catalog.reason_masks
+    base = applicant_values(app, ref, catalog)
+    _, now = fund_masks(base)
+
+    # 1) 게이트 사유 해소
+    adjusted, shift = base, 0
+    v, segments = _variants(base, app, ref)
+    for i, ((_, hit_now), (_, hit)) in enumerate(zip(reason_masks(base), reason_masks(v))):
+        if not hit_now:
+            continue
+        cleared = lambda vv, i=i: ~np.asarray(reason_masks(vv)[i][1])
+        for lever, seg, values in segments:
+            ok = ~np.asarray(hit[seg])
+            if ok.any():
+                value = _nearest(ok, lever, values, adjusted, 0, cleared)
+                adjusted = _apply(adjusted, app, ref, lever, value)
+                if lever == "months":
+                    shift = value
+                break
+
+    # 2) 자금별 변경 조건 (게이트 해소값 기준으로 한 번 더 일괄 판정)
+    _, ready = fund_masks(adjusted)
+    v, segments = _variants(adjusted, app, add_months(ref, shift))
+    _, masks = fund_masks(v)
+
+    hints = []
+    for fund in catalog.funds:
+        fid = fund["id"]
+        if now[fid]:
+            continue
+        finals = []
+        if ready[fid]:
+            finals.append((adjusted, shift))
+        else:
+            matched = lambda vv, fid=fid: fund_masks(vv)[1][fid]
+            for lever, seg, values in segments:
+                ok = masks[fid][seg]
+                if not ok.any() or (lever == "credit_pair" and finals):
+                    continue
+                value = _nearest(ok, lever, values, adjusted, shift, matched)
+                finals.append((_apply(adjusted, app, ref, lever, value), value if lever == "months" else shift))
+        for final, months in finals:
+            changes = _describe(base, final, months)
+            hints.append({"fund": fund["name"], "changes": changes, "text": " + ".join(c["text"] for c in changes),
+                          "catalog_version": catalog.version})
+    return hints